@@ -0,0 +1,59 @@
+"""
+Compares the executors used by BookClubAggregator to normalize ratings.
+
+Usage:
+    python benchmarks/bench_executors.py --rows 500000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# make the modules in src importable when run from the repository root
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from executors import (  # noqa: E402
+    default_executor_kind,
+    free_threading_enabled,
+    normalize_ratings,
+    subinterpreters_available,
+)
+from synthetic_ratings import generate_rows  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executor benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk_size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(
+        f"Python {sys.version.split()[0]}, free-threaded: {free_threading_enabled()}, "
+        f"subinterpreters: {subinterpreters_available()}, "
+        f"default executor: {default_executor_kind(args.workers)}"
+    )
+    rows = list(generate_rows(args.rows))
+
+    # without subinterpreters the interpreter kind would just time the process pool again
+    kinds = ["serial", "thread", "process"]
+    if subinterpreters_available():
+        kinds.insert(2, "interpreter")
+
+    expected = None
+    for kind in kinds:
+        start = time.perf_counter()
+        result = normalize_ratings(rows, kind, args.workers, args.chunk_size)
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = result
+        assert list(result.items()) == list(expected.items()), kind
+        print(f"{kind:12}: {elapsed:.3f}s,\t{args.rows / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
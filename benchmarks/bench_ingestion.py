@@ -0,0 +1,398 @@
+"""
+Benchmarks the ingestion and aggregation path on synthetic ratings and checks it against a saved baseline.
+
+Phases:
+    csv_reader: CSVReader.read_data, only with --legacy
+    read:       input_adapters.read_ratings
+    normalize:  executors.normalize_ratings
+    stream:     CSVAdapter.iter_rows streamed into normalize_ratings, replaces read and normalize with --stream
+    build:      BookClubAggregator.build_books
+    aggregate:  BookClubAggregator.aggregate_book_stats
+
+Timings are the fastest of several runs. The memory of each phase is measured in one extra run with tracemalloc,
+as the peak of Python allocations above what was live when the phase started. Process pool workers are not
+traced, their peak RSS is reported separately.
+
+From STREAMING_ROWS rows on, the rows are streamed instead of read into a list, and the tracemalloc run, which
+is several times slower, is skipped unless --trace_memory is passed.
+
+Usage:
+    python benchmarks/bench_ingestion.py --rows 1000000 --save_baseline
+    python benchmarks/bench_ingestion.py --rows 1000000 --check --threshold 0.2
+    python benchmarks/bench_ingestion.py --rows 50000000 --repeat 1
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINES_DIR = os.path.join(BENCHMARKS_DIR, "baselines")
+
+# make the modules in src importable when run from the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS_DIR), "src"))
+
+from book_club_aggregator import BookClubAggregator  # noqa: E402
+from csv_reader import CSVReader  # noqa: E402
+from executors import normalize_ratings  # noqa: E402
+from input_adapters import CSVAdapter, read_ratings  # noqa: E402
+from synthetic_ratings import write_csv  # noqa: E402
+
+PHASES = ("csv_reader", "read", "normalize", "stream", "build", "aggregate")
+
+# reading 5M rows into a list takes about 1 GB
+STREAMING_ROWS = 5_000_000
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """
+    Returns the peak resident set size so far, or None where it cannot be measured.
+
+    Args:
+        children (bool): Whether to return the peak of the largest terminated child process, e.g. a process pool
+            worker, instead of this process.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    if not peak:
+        return None
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return round(peak / 2**20, 1)
+    return round(peak / 2**10, 1)
+
+
+class PhaseRecorder:
+    """
+    Records the seconds each phase takes, or with trace_memory the peak memory each phase allocates.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.timings: Dict[str, List[float]] = {}
+        self.peaks_mb: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            live = tracemalloc.get_traced_memory()[0]
+            yield
+            self.peaks_mb[phase] = round(
+                (tracemalloc.get_traced_memory()[1] - live) / 2**20, 2
+            )
+            return
+
+        start = time.perf_counter()
+        yield
+        self.timings.setdefault(phase, []).append(time.perf_counter() - start)
+
+
+def run_phases(
+    file_path: str,
+    executor: str,
+    recorder: PhaseRecorder,
+    legacy: bool = False,
+    stream: bool = False,
+) -> Tuple[int, int]:
+    """
+    Runs every phase once, measuring each with the recorder.
+
+    With stream, the rows are normalized as they are read, without holding them all in memory, and reading and
+    normalization are measured together as the "stream" phase.
+
+    Returns:
+        Tuple[int, int]: The number of books and of invalid rows.
+    """
+    if legacy:
+        with recorder.measure("csv_reader"):
+            legacy_rows = CSVReader.read_data(file_path)
+        del legacy_rows
+
+    if stream:
+        adapter = CSVAdapter()
+        with recorder.measure("stream"):
+            ratings = normalize_ratings(adapter.iter_rows(file_path), executor)
+        errors = adapter.errors
+    else:
+        with recorder.measure("read"):
+            rows, errors = read_ratings(file_path)
+
+        with recorder.measure("normalize"):
+            ratings = normalize_ratings(rows, executor)
+        del rows
+
+    aggregator = BookClubAggregator([])
+    with recorder.measure("build"):
+        aggregator.books = aggregator.build_books(ratings)
+
+    with recorder.measure("aggregate"):
+        book_stats = aggregator.aggregate_book_stats()
+
+    return len(book_stats), len(errors)
+
+
+def run_benchmark(
+    file_path: str,
+    num_rows: int,
+    executor: str = "serial",
+    repeat: int = 3,
+    legacy: bool = False,
+    stream: bool = False,
+    trace_memory: bool = True,
+) -> Dict:
+    """
+    Runs every phase on a ratings file, keeping the fastest of several runs per phase, then measures the memory of
+    each phase in one more run.
+
+    Args:
+        file_path (str): The path to a headerless ratings CSV file.
+        num_rows (int): The number of rows in the file.
+        executor (str): The executor kind used for normalization.
+        repeat (int): The number of timed runs.
+        legacy (bool): Whether to also benchmark the legacy CSVReader.
+        stream (bool): Whether to normalize the rows as they are read, see run_phases.
+        trace_memory (bool): Whether to measure the memory of each phase. Peak MB is None otherwise.
+
+    Returns:
+        Dict: Per-phase seconds, rows/s and peak MB, the peak RSS of the process and its workers, and the totals.
+    """
+    recorder = PhaseRecorder()
+    for _ in range(repeat):
+        num_books, num_invalid_rows = run_phases(
+            file_path, executor, recorder, legacy, stream
+        )
+    process_peak_rss_mb = peak_rss_mb()
+    # only process pool workers are children, the interpreter executor falls back to them
+    workers_peak_rss_mb = None
+    if executor in ("process", "interpreter"):
+        workers_peak_rss_mb = peak_rss_mb(children=True)
+
+    memory_recorder = PhaseRecorder(trace_memory=True)
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            run_phases(file_path, executor, memory_recorder, legacy, stream)
+        finally:
+            tracemalloc.stop()
+
+    phases = {}
+    for phase in PHASES:
+        if phase not in recorder.timings:
+            continue
+        seconds = min(recorder.timings[phase])
+        phases[phase] = {
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(num_rows / seconds) if seconds else None,
+            "peak_mb": memory_recorder.peaks_mb.get(phase),
+        }
+
+    return {
+        "rows": num_rows,
+        "books": num_books,
+        "invalid_rows": num_invalid_rows,
+        "executor": executor,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "phases": phases,
+        "total_seconds": round(sum(phase["seconds"] for phase in phases.values()), 4),
+        "peak_rss_mb": process_peak_rss_mb,
+        "workers_peak_rss_mb": workers_peak_rss_mb,
+    }
+
+
+def baseline_path(num_rows: int, executor: str, dataset: str) -> str:
+    """
+    Returns the baseline file of a benchmark configuration.
+
+    Args:
+        num_rows (int): The number of rows.
+        executor (str): The executor kind used for normalization.
+        dataset (str): What the rows are, e.g. the titles, members and seed they were generated with.
+    """
+    return os.path.join(
+        BASELINES_DIR, f"ingestion_{num_rows}_{dataset}_{executor}.json"
+    )
+
+
+def check_regressions(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compares a benchmark result with a baseline.
+
+    Args:
+        result (Dict): The result of run_benchmark.
+        baseline (Dict): A saved result of run_benchmark for the same number of rows.
+        threshold (float): The allowed relative slowdown or memory growth, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: A message for every phase that got slower or allocates more memory, and for peak RSS if it
+            grew, beyond the threshold.
+    """
+    regressions = []
+    for phase, baseline_phase in baseline["phases"].items():
+        current_phase = result["phases"].get(phase)
+        if current_phase is None:
+            continue
+        if baseline_phase.get("rows_per_second"):
+            ratio = current_phase["rows_per_second"] / baseline_phase["rows_per_second"]
+            if ratio < 1 - threshold:
+                regressions.append(
+                    f"{phase}: {current_phase['rows_per_second']:,} rows/s is "
+                    f"{1 - ratio:.0%} slower than the baseline "
+                    f"{baseline_phase['rows_per_second']:,} rows/s"
+                )
+        if baseline_phase.get("peak_mb") and current_phase.get("peak_mb"):
+            growth = current_phase["peak_mb"] / baseline_phase["peak_mb"] - 1
+            if growth > threshold:
+                regressions.append(
+                    f"{phase}: peak {current_phase['peak_mb']} MB is {growth:.0%} "
+                    f"above the baseline {baseline_phase['peak_mb']} MB"
+                )
+
+    for key, name in (
+        ("peak_rss_mb", "peak RSS"),
+        ("workers_peak_rss_mb", "workers peak RSS"),
+    ):
+        if result.get(key) and baseline.get(key):
+            growth = result[key] / baseline[key] - 1
+            if growth > threshold:
+                regressions.append(
+                    f"{name}: {result[key]} MB is {growth:.0%} above the "
+                    f"baseline {baseline[key]} MB"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingestion and aggregation benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--titles", type=int, default=5_000)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--file",
+        help="Benchmark an existing headerless ratings CSV instead of generating one",
+        default=None,
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["serial", "thread", "interpreter", "process"],
+        default="serial",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Keep the fastest of this many runs"
+    )
+    parser.add_argument(
+        "--save_baseline", action="store_true", help="Save the result as the baseline"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Fail if the result regressed"
+    )
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also benchmark the legacy CSVReader, which holds every row as a dictionary",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=f"Normalize rows as they are read (default from {STREAMING_ROWS:,} rows)",
+    )
+    parser.add_argument(
+        "--trace_memory",
+        action="store_true",
+        help=f"Measure the memory of each phase (default below {STREAMING_ROWS:,} rows)",
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--output", help="Also write the result to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = args.file
+        num_rows = args.rows
+        if file_path is None:
+            file_path = os.path.join(temp_dir, "ratings.csv")
+            start = time.perf_counter()
+            write_csv(
+                file_path,
+                num_rows,
+                num_titles=args.titles,
+                num_members=args.members,
+                seed=args.seed,
+            )
+            print(
+                f"Generated {num_rows:,} ratings in {time.perf_counter() - start:.1f}s"
+            )
+            dataset = f"t{args.titles}_m{args.members}_s{args.seed}"
+        else:
+            with open(file_path, "rb") as f:
+                num_rows = sum(1 for _ in f)
+            dataset = os.path.splitext(os.path.basename(file_path))[0]
+
+        large = num_rows >= STREAMING_ROWS
+        stream = args.stream or large
+        if stream:
+            dataset += "_stream"
+        result = run_benchmark(
+            file_path,
+            num_rows,
+            args.executor,
+            args.repeat,
+            args.legacy,
+            stream,
+            trace_memory=args.trace_memory or not large,
+        )
+
+    for phase, stats in result["phases"].items():
+        print(
+            f"{phase:12}{stats['seconds']:10.3f}s"
+            f"{stats['rows_per_second'] or 0:>14,} rows/s"
+            + (f"{stats['peak_mb']:>12} MB" if stats["peak_mb"] is not None else "")
+        )
+    print(f"{'total':12}{result['total_seconds']:10.3f}s")
+    print(f"{'peak RSS':12}{result['peak_rss_mb'] or 0:>10} MB")
+    if result["workers_peak_rss_mb"]:
+        print(f"{'workers RSS':12}{result['workers_peak_rss_mb']:>10} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    path = baseline_path(num_rows, args.executor, dataset)
+    if args.save_baseline:
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved to '{path}'")
+
+    if args.check:
+        if not os.path.exists(path):
+            print(f"No baseline at '{path}', create one with --save_baseline")
+            return 1
+        with open(path) as f:
+            regressions = check_regressions(result, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against '{path}'")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Generates synthetic ratings files shaped like data/ratings.csv.
+
+Titles and members are drawn from Zipf distributions, so a few books and members account for most ratings, and
+their casing and surrounding whitespace is messed up the way hand-entered data is.
+
+Usage:
+    python benchmarks/synthetic_ratings.py --rows 1000000 --output ratings_1m.csv
+"""
+
+import argparse
+import csv
+import itertools
+import random
+from typing import Callable, Iterator, List, Tuple
+
+WORDS = (
+    "the art of clean code design patterns elements reusable object oriented software "
+    "proof primed to perform extreme ownership thinking fast and slow pragmatic "
+    "programmer complete refactoring structure interpretation computer programs "
+    "deep work atomic habits mythical man month peopleware drive mindset grit "
+    "lean startup zero one hard thing about things good great seven habits effective "
+    "people principles sapiens history tomorrow origin species selfish gene brief time"
+).split()
+FIRST_NAMES = (
+    "Alex Jordan David Lauren Sam Taylor Morgan Casey Riley Jamie Avery Quinn Drew "
+    "Robin Skyler Parker Reese Emerson Rowan Hayden Kai Sage Elliot Finley"
+).split()
+STARS = [i / 2 for i in range(11)]
+
+
+def zipf_cum_weights(size: int, exponent: float) -> List[float]:
+    """
+    Returns cumulative Zipf weights for ranks 1 to size, for use with random.choices.
+    """
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, size + 1)))
+
+
+def unique_names(count: int, make_name: Callable[[int], str]) -> List[str]:
+    """
+    Draws names until count distinct ones are found, in the order they were drawn.
+
+    The order must not depend on set iteration order, which changes with PYTHONHASHSEED.
+    """
+    names = []
+    seen = set()
+    while len(names) < count:
+        name = make_name(len(names))
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def make_titles(num_titles: int, rng: random.Random) -> List[str]:
+    def make_title(num_found: int) -> str:
+        words = rng.sample(WORDS, rng.randint(1, 5))
+        suffix = f" {rng.randint(2, 99)}" if num_found >= len(WORDS) else ""
+        return " ".join(words).title() + suffix
+
+    titles = unique_names(num_titles, make_title)
+    rng.shuffle(titles)
+    return titles
+
+
+def make_members(num_members: int, rng: random.Random) -> List[str]:
+    def make_member(num_found: int) -> str:
+        suffix = f"{rng.randint(2, 999)}" if num_found >= 26 * len(FIRST_NAMES) else ""
+        return f"{rng.choice(FIRST_NAMES)} {chr(rng.randint(65, 90))}{suffix}".strip()
+
+    members = unique_names(num_members, make_member)
+    rng.shuffle(members)
+    return members
+
+
+def mess_up(name: str, rng: random.Random) -> str:
+    """
+    Randomly changes the casing and surrounding whitespace of a name, like the entries in data/ratings.csv.
+    """
+    roll = rng.random()
+    if roll < 0.15:
+        name = name.lower()
+    elif roll < 0.2:
+        name = name.upper()
+    elif roll < 0.35:
+        name = name[:1].lower() + name[1:]
+    if rng.random() < 0.2:
+        name = name + " " * rng.randint(1, 2)
+    if rng.random() < 0.05:
+        name = " " + name
+    return name
+
+
+def generate_rows(
+    num_rows: int,
+    num_titles: int = 5_000,
+    num_members: int = 500,
+    exponent: float = 1.1,
+    seed: int = 0,
+    chunk_size: int = 100_000,
+) -> Iterator[Tuple[str, str, float]]:
+    """
+    Yields synthetic (book title, member name, stars) rows without holding them all in memory.
+
+    Args:
+        num_rows (int): The number of rows to generate.
+        num_titles (int): The number of distinct books.
+        num_members (int): The number of distinct members.
+        exponent (float): The Zipf exponent of the title and member distributions.
+        seed (int): The random seed, the same seed always produces the same rows.
+        chunk_size (int): The number of rows drawn at once.
+
+    Yields:
+        Tuple[str, str, float]: The next row.
+    """
+    rng = random.Random(seed)
+    titles = make_titles(num_titles, rng)
+    members = make_members(num_members, rng)
+    title_weights = zipf_cum_weights(num_titles, exponent)
+    member_weights = zipf_cum_weights(num_members, exponent)
+
+    # pre-compute a pool of messy spellings of every name, so rows are drawn without string work
+    messy_titles = [[mess_up(title, rng) for _ in range(4)] for title in titles]
+    messy_members = [[mess_up(member, rng) for _ in range(4)] for member in members]
+
+    remaining = num_rows
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        title_ranks = rng.choices(range(num_titles), cum_weights=title_weights, k=size)
+        member_ranks = rng.choices(
+            range(num_members), cum_weights=member_weights, k=size
+        )
+        variants = rng.choices(range(4), k=size * 2)
+        stars = rng.choices(STARS, k=size)
+        for i in range(size):
+            yield (
+                messy_titles[title_ranks[i]][variants[2 * i]],
+                messy_members[member_ranks[i]][variants[2 * i + 1]],
+                stars[i],
+            )
+        remaining -= size
+
+
+def write_csv(file_path: str, num_rows: int, **kwargs) -> None:
+    """
+    Writes synthetic rows to a headerless CSV file in the format of data/ratings.csv.
+
+    Args:
+        file_path (str): The path to the output file.
+        num_rows (int): The number of rows to write.
+        **kwargs: Arguments passed to generate_rows.
+    """
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for book_title, member_name, num_stars in generate_rows(num_rows, **kwargs):
+            writer.writerow((book_title, member_name, f"{num_stars:g}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic ratings generator")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--titles", type=int, default=5_000)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    write_csv(
+        args.output,
+        args.rows,
+        num_titles=args.titles,
+        num_members=args.members,
+        seed=args.seed,
+    )
+    print(f"Wrote {args.rows:,} ratings to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import logging
-from typing import Dict, List, Union
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
 
 from book import Book
+from executors import normalize_ratings
+from input_adapters import RatingRow
 from member import Member
-from normalizer import Normalizer
+from ratings_store import RatingsStore
 
 logging.basicConfig(level=logging.ERROR)
 
@@ -13,23 +16,56 @@ class BookClubAggregator:
     A class for aggregating and displaying statistics for a book club's reading data from a CSV file.
     """
 
-    def __init__(self, csv_data: List[Dict[str, Union[str, float]]]):
+    def __init__(
+        self,
+        csv_data: Iterable[Union[RatingRow, Dict[str, Union[str, float]]]],
+        store: Optional[RatingsStore] = None,
+        rated_at: Optional[datetime] = None,
+        executor: str = "serial",
+        max_workers: Optional[int] = None,
+    ):
         """
         Initialize a BookClubAggregator object.
 
         Args:
-            csv_data (List[Dict[str, Union[str, float]]]): A list of dictionaries containing book ratings data.
+            csv_data (Iterable[Union[RatingRow, Dict[str, Union[str, float]]]]): Typed rating rows or dictionaries
+                containing book ratings data.
+            store (Optional[RatingsStore]): A ratings store to append the ratings to, enabling historical stats.
+            rated_at (Optional[datetime]): When the ratings were made, defaults to now.
+            executor (str): How to normalize the rows: "serial", "thread", "interpreter", "process" or "auto".
+            max_workers (Optional[int]): The number of parallel workers, defaults to the number of CPUs.
         """
+        self.store = store
+        self.rated_at = rated_at
+        self.executor = executor
+        self.max_workers = max_workers
         self.books: Dict[str, Book] = self.process_csv_data(csv_data)
 
     def process_csv_data(
-        self, csv_data: List[Dict[str, Union[str, float]]]
+        self, csv_data: Iterable[Union[RatingRow, Dict[str, Union[str, float]]]]
     ) -> Dict[str, Book]:
         """
         Process CSV data and return a dictionary of books.
 
+        Rows are normalized in chunks on the configured executor, then the books and members are built from the
+        merged chunks in the original row order.
+
         Args:
-            csv_data (List[Dict[str, Union[str, float]]]): A list of dictionaries containing book ratings data.
+            csv_data (Iterable[Union[RatingRow, Dict[str, Union[str, float]]]]): Typed rating rows or dictionaries
+                containing book ratings data. Typed rows are used as is, dictionaries have their rating parsed.
+
+        Returns:
+            Dict[str, Book]: A dictionary mapping book names to Book objects.
+        """
+        ratings = normalize_ratings(csv_data, self.executor, self.max_workers)
+        return self.build_books(ratings)
+
+    def build_books(self, ratings: Dict[Tuple[str, str], float]) -> Dict[str, Book]:
+        """
+        Build books and members from normalized ratings, and record them in the ratings store.
+
+        Args:
+            ratings (Dict[Tuple[str, str], float]): The latest rating per (book title, member name).
 
         Returns:
             Dict[str, Book]: A dictionary mapping book names to Book objects.
@@ -37,11 +73,7 @@ class BookClubAggregator:
         book_data: Dict[str, Book] = {}
         member_data: Dict[str, Member] = {}
 
-        for row in csv_data:
-            book_title = Normalizer.normalize_name(row["book_title"])
-            member_name = Normalizer.normalize_name(row["member_name"])
-            rating = float(row["num_stars"])
-
+        for (book_title, member_name), rating in ratings.items():
             if book_title not in book_data:
                 book_data[book_title] = Book(book_title)
 
@@ -52,13 +84,31 @@ class BookClubAggregator:
                 book=book_data[book_title], num_stars=rating
             )
 
+        if self.store is not None:
+            self.store.add_ratings(
+                (
+                    (book_title, member_name, rating)
+                    for (book_title, member_name), rating in ratings.items()
+                ),
+                self.rated_at,
+            )
+
         return book_data
 
-    def display_stats(self) -> None:
+    def display_stats(
+        self, book_stats: Optional[Dict[str, Dict[str, Union[float, int]]]] = None
+    ) -> None:
         """
         Display book statistics.
+
+        Args:
+            book_stats (Optional[Dict[str, Dict[str, Union[float, int]]]]): The statistics to display, defaults to
+                the statistics of all books.
         """
-        book_stats = self.aggregate_book_stats()
+        if book_stats is None:
+            book_stats = self.aggregate_book_stats()
+        if not book_stats:
+            return
 
         max_title_length = max(len(title) for title in book_stats.keys())
         max_line_length = 120  # Total line width
@@ -85,15 +135,39 @@ class BookClubAggregator:
         Returns:
             Dict[str, Dict[str, Union[float, int]]]: A dictionary mapping book names to dictionaries containing book statistics.
         """
-        book_stats = {}
+        return dict(self.iter_book_stats())
+
+    def iter_book_stats(self) -> Iterator[Tuple[str, Dict[str, Union[float, int]]]]:
+        """
+        Compute statistics for books one book at a time, for streaming exports.
+
+        Yields:
+            Tuple[str, Dict[str, Union[float, int]]]: A book name and a dictionary containing its statistics.
+        """
         for book_name, book in self.books.items():
             avg_rating = round(book.average_rating(), 1)
             num_favorites = book.count_favorites()
             num_least_favorites = book.count_least_favorites()
 
-            book_stats[book_name] = {
+            yield book_name, {
                 "rating": avg_rating,
                 "favorites": num_favorites,
                 "least_favorites": num_least_favorites,
             }
-        return book_stats
+
+    def aggregate_window_stats(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Union[float, int]]]:
+        """
+        Aggregate statistics for books from the ratings store, over ratings made within a time window.
+
+        Args:
+            start (Optional[datetime]): The inclusive start of the window, unbounded if None.
+            end (Optional[datetime]): The exclusive end of the window, unbounded if None.
+
+        Returns:
+            Dict[str, Dict[str, Union[float, int]]]: A dictionary mapping book names to dictionaries containing book statistics.
+        """
+        if self.store is None:
+            raise ValueError("Historical stats require a ratings store")
+        return self.store.book_stats(start, end)
@@ -1,21 +1,32 @@
 import asyncio
 import logging
 import os
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Optional, Union
 
 from notion_client.errors import APIResponseError
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from tenacity import (
+    AsyncRetrying,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_fixed,
+)
 
-from normalizer import Normalizer
 from notion_db_API import NotionDBAPI
+from notion_page_parser import NotionPageParser
+from sync_journal import SyncJournal
+from sync_planner import ChangePlan, SyncPlanner
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+RETRY_ATTEMPTS = 5
+RETRY_WAIT_SECONDS = 1
+
 retry_decorator = retry(
-    wait=wait_fixed(1),
-    stop=stop_after_attempt(5),
+    wait=wait_fixed(RETRY_WAIT_SECONDS),
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
     retry=retry_if_exception_type(APIResponseError),
 )
 
@@ -25,24 +36,58 @@ class BookManager:
     Manages the business logic for book entries in the Notion database.
     """
 
-    def __init__(self, api: NotionDBAPI):
+    def __init__(
+        self,
+        api: NotionDBAPI,
+        filter_properties: bool = True,
+        journal: Optional[SyncJournal] = None,
+    ):
         self.api = api
         self.database_id = api.database_id or os.getenv("NOTION_DATABASE_ID")
         self.notion = api.notion
+        self.filter_properties = filter_properties
+        self.journal = journal
+        self._property_ids: Optional[List[str]] = None
+
+    async def get_property_ids(self) -> Optional[List[str]]:
+        """
+        Looks up the IDs of the book properties so queries only return those properties.
+
+        Returns:
+            Optional[List[str]]: The property IDs, or None if queries should return all properties.
+        """
+        if not self.filter_properties:
+            return None
+
+        if self._property_ids is None:
+            try:
+                database = await self.api.retrieve_database()
+                self._property_ids = NotionPageParser.property_ids(database)
+            except APIResponseError as error:
+                logger.warning(
+                    f"Could not retrieve database properties ({error.code}), querying all properties"
+                )
+                self._property_ids = []
+        return self._property_ids or None
 
     @retry_decorator
     async def get_existing_ratings(self) -> Dict[str, Dict[str, Union[int, str]]]:
         """
         Fetches existing ratings from the Notion database.
 
+        Pages are parsed batch by batch as they are returned by the paginated query.
+
         Returns:
             Dict[str, Dict[str, Union[int, str]]]: A dictionary containing existing ratings.
         """
         try:
-            all_entries = await NotionDBAPI.fetch_paginated_results(
-                self.notion.databases.query, database_id=self.database_id
-            )
-            return await self.get_existing_book_entries(all_entries)
+            existing_book_entries = {}
+            async for results in NotionDBAPI.iter_paginated_results(
+                self.api.query_database,
+                filter_properties=await self.get_property_ids(),
+            ):
+                NotionPageParser.parse_pages(results, existing_book_entries)
+            return existing_book_entries
         except APIResponseError as error:
             logger.error(f"API Error ({error.code}): {error.body}")
             return {}
@@ -50,36 +95,28 @@ class BookManager:
             logger.exception(f"Unexpected error: {error}")
             return {}
 
-    @retry_decorator
     async def get_existing_book_entries(
-        self, data: List[Dict[str, str]]
-    ) -> Dict[str, str]:
+        self, data: Iterable[Dict]
+    ) -> Dict[str, Dict[str, Union[str, float, None]]]:
         """
         Extracts existing book entries from Notion database data.
 
+        Pages without a title are skipped and missing numbers are returned as None.
+
         Args:
-            data (List[Dict[str, str]]): List of database entries.
+            data (Iterable[Dict]): Database entries.
 
         Returns:
-            Dict[str, str]: A dictionary containing existing book entries.
+            Dict[str, Dict[str, Union[str, float, None]]]: A dictionary containing existing book entries.
         """
-        existing_book_entries = {}
-        for entry in data:
-            book_title = Normalizer.normalize_name(
-                entry["properties"]["Book Title"]["title"][0]["text"]["content"]
-            )
-
-            existing_book_entries[book_title] = {
-                "pageId": entry["id"],
-                "rating": entry["properties"]["Rating"]["number"],
-                "favorites": entry["properties"]["Favorites"]["number"],
-                "least_favorites": entry["properties"]["Least Favorites"]["number"],
-            }
-        return existing_book_entries
+        return NotionPageParser.parse_pages(data)
 
     @retry_decorator
     async def upsert_books_to_database(
-        self, new_ratings: Dict[str, Dict], existing_ratings: Dict[str, Dict]
+        self,
+        new_ratings: Dict[str, Dict],
+        existing_ratings: Dict[str, Dict],
+        archive_orphans: bool = False,
     ) -> None:
         """
         Update or add books in the database based on new ratings.
@@ -87,67 +124,202 @@ class BookManager:
         Args:
             new_ratings (Dict[str, Dict]): Dictionary containing new ratings.
             existing_ratings (Dict[str, Dict]): Dictionary containing existing ratings.
+            archive_orphans (bool): Whether to archive entries for books that are no longer rated.
         """
-        books_to_update = []
-        books_to_add = []
+        await self.apply_plan(
+            SyncPlanner.plan(new_ratings, existing_ratings, archive_orphans)
+        )
 
-        for book_title, book_stats in new_ratings.items():
-            if book_title in existing_ratings:
-                existing_entry = existing_ratings[book_title]
+    async def apply_plan(
+        self, plan: ChangePlan, input_digest: Optional[str] = None
+    ) -> None:
+        """
+        Apply a change plan to the database, recording it in the journal first.
 
-                differences = [
-                    book_stats["rating"] != existing_entry.get("rating", 0),
-                    book_stats["favorites"] != existing_entry.get("favorites", 0),
-                    book_stats["least_favorites"]
-                    != existing_entry.get("least_favorites", 0),
-                ]
+        Args:
+            plan (ChangePlan): The planned creates, updates and archives.
+            input_digest (Optional[str]): The digest the run is journaled under, defaults to the digest of the
+                ratings the plan was computed from. Saved plans use their plan_digest.
+        """
+        run_id = None
+        if self.journal:
+            run_id = self.journal.begin(input_digest or plan.input_digest)
+            self.journal.plan(run_id, "update", plan.updates)
+            self.journal.plan(run_id, "create", plan.creates)
+            self.journal.plan(run_id, "archive", plan.archives)
 
-                if any(differences):
-                    updated_entry = {
-                        **book_stats,
-                        "book": book_title,
-                        "pageId": existing_entry["pageId"],
-                    }
+        await self.apply_operations(plan.updates, plan.creates, plan.archives, run_id)
 
-                    books_to_update.append(updated_entry)
-            else:
-                new_entry = {**book_stats, "book": book_title}
-                books_to_add.append(new_entry)
+    async def resume_sync(self, input_digest: str) -> bool:
+        """
+        Resume an interrupted sync of the same input from the journal, without re-fetching existing ratings.
+
+        Args:
+            input_digest (str): The digest of the ratings or plan being synced, see SyncJournal.digest.
 
+        Returns:
+            bool: True if an interrupted sync was resumed, False if there was nothing to resume.
+        """
+        if not self.journal:
+            return False
+
+        run_id = self.journal.resumable_run(input_digest)
+        if run_id is None:
+            return False
+
+        pending = self.journal.pending_operations(run_id)
+        logger.info(f"Resuming sync {run_id} with {len(pending)} pending operations")
+        entries = {"update": [], "create": [], "archive": []}
+        for operation in pending:
+            entries[operation["op"]].append(operation["entry"])
+        await self.apply_operations(
+            entries["update"], entries["create"], entries["archive"], run_id
+        )
+        return True
+
+    async def apply_operations(
+        self,
+        books_to_update: List[Dict],
+        books_to_add: List[Dict],
+        books_to_archive: List[Dict],
+        run_id: Optional[str] = None,
+    ) -> None:
+        """
+        Apply updates, creates and archives, recording each acknowledged operation in the journal.
+
+        Args:
+            books_to_update (List[Dict]): Book entries to update.
+            books_to_add (List[Dict]): Book entries to create.
+            books_to_archive (List[Dict]): Book entries to archive.
+            run_id (Optional[str]): The journal run the operations belong to.
+        """
+        keys = []
         for entry in books_to_update:
-            await self.update_book(entry)
+            key = self._journal_key(run_id, "update", entry)
+            await self.update_book(entry, key=key)
+            keys.append(key)
 
         for entry in books_to_add:
-            await self.add_book(entry)
+            key = self._journal_key(run_id, "create", entry)
+            await self.add_book(entry, key=key)
+            keys.append(key)
 
-    @retry_decorator
-    async def add_book(self, book_entry: Dict):
+        for entry in books_to_archive:
+            key = self._journal_key(run_id, "archive", entry)
+            await self.archive_book(entry, key=key)
+            keys.append(key)
+
+        if self.journal and run_id and all(self.journal.is_done(key) for key in keys):
+            self.journal.finish(run_id)
+
+    def _journal_key(self, run_id: Optional[str], operation: str, entry: Dict):
+        if not self.journal or not run_id:
+            return None
+        return SyncJournal.make_key(run_id, operation, entry["book"])
+
+    async def add_book(self, book_entry: Dict, key: Optional[str] = None):
         """
         Add a new book entry to the Notion database.
 
+        If the journal shows an earlier attempt for this key, the database is checked for an already
+        created page first, since page creation is not idempotent.
+
         Args:
             book_entry (Dict): A dictionary containing book entry data.
+            key (Optional[str]): The journal key of the operation.
         """
         try:
-            return await self.api.add_page(await self.get_properties(book_entry))
+            if self.journal and key:
+                if self.journal.is_done(key):
+                    return None
+                if self.journal.was_started(key):
+                    pages = await self.api.find_pages_by_title(book_entry["book"])
+                    if pages:
+                        self.journal.complete(key, pages[0]["id"])
+                        return pages[0]
+                self.journal.start(key)
+
+            page = await self.create_page(book_entry)
+            if self.journal and key:
+                self.journal.complete(key, page["id"])
+            return page
         except APIResponseError as error:
             logger.error(f"API Error ({error.code}): {error.body}")
         except Exception as error:
             logger.exception(f"Unexpected error: {error}")
 
+    async def create_page(self, book_entry: Dict) -> Dict:
+        """
+        Create the page of a book entry, retrying on API errors.
+
+        Page creation is not idempotent and Notion may have saved a page whose response failed, so every retry
+        first looks for a page with the same title.
+
+        Args:
+            book_entry (Dict): A dictionary containing book entry data.
+
+        Returns:
+            Dict: The created or already existing Notion page.
+        """
+        async for attempt in AsyncRetrying(
+            wait=wait_fixed(RETRY_WAIT_SECONDS),
+            stop=stop_after_attempt(RETRY_ATTEMPTS),
+            retry=retry_if_exception_type(APIResponseError),
+            reraise=True,
+        ):
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    pages = await self.api.find_pages_by_title(book_entry["book"])
+                    if pages:
+                        return pages[0]
+                return await self.api.add_page(await self.get_properties(book_entry))
+
     @retry_decorator
-    async def update_book(self, updated_book_entry: Dict):
+    async def update_book(self, updated_book_entry: Dict, key: Optional[str] = None):
         """
         Update an existing book entry in the Notion database.
 
         Args:
             updated_book_entry (Dict): A dictionary containing updated book entry data.
+            key (Optional[str]): The journal key of the operation.
         """
         try:
-            return await self.api.update_page(
+            if self.journal and key:
+                if self.journal.is_done(key):
+                    return None
+                self.journal.start(key)
+
+            page = await self.api.update_page(
                 updated_book_entry["pageId"],
                 await self.get_properties(updated_book_entry),
             )
+            if self.journal and key:
+                self.journal.complete(key, updated_book_entry["pageId"])
+            return page
+        except APIResponseError as error:
+            logger.error(f"API Error ({error.code}): {error.body}")
+        except Exception as error:
+            logger.exception(f"Unexpected error: {error}")
+
+    @retry_decorator
+    async def archive_book(self, book_entry: Dict, key: Optional[str] = None):
+        """
+        Archive a book entry in the Notion database.
+
+        Args:
+            book_entry (Dict): A dictionary containing the book title and page ID.
+            key (Optional[str]): The journal key of the operation.
+        """
+        try:
+            if self.journal and key:
+                if self.journal.is_done(key):
+                    return None
+                self.journal.start(key)
+
+            page = await self.api.archive_page(book_entry["pageId"])
+            if self.journal and key:
+                self.journal.complete(key, book_entry["pageId"])
+            return page
         except APIResponseError as error:
             logger.error(f"API Error ({error.code}): {error.body}")
         except Exception as error:
@@ -0,0 +1,239 @@
+import collections
+import concurrent.futures
+import itertools
+import logging
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from normalizer import Normalizer
+
+logger = logging.getLogger(__name__)
+
+
+EXECUTOR_KINDS = ("auto", "serial", "thread", "interpreter", "process")
+DEFAULT_CHUNK_SIZE = 50_000
+
+# (book title, member name) -> number of stars, in first-seen order
+PartialRatings = Dict[Tuple[str, str], float]
+
+
+def free_threading_enabled() -> bool:
+    """
+    Checks whether the interpreter runs without the GIL (free-threaded Python 3.13t or later).
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def subinterpreters_available() -> bool:
+    """
+    Checks whether a subinterpreter pool executor is available (Python 3.14 or later).
+    """
+    return hasattr(concurrent.futures, "InterpreterPoolExecutor")
+
+
+def default_executor_kind(max_workers: Optional[int] = None) -> str:
+    """
+    Picks the fastest executor kind for CPU-bound work on this interpreter.
+
+    Args:
+        max_workers (Optional[int]): The number of workers, defaults to the number of CPUs.
+
+    Returns:
+        str: "serial" with a single worker, since one worker only adds overhead, otherwise "thread" on
+            free-threaded Python, "interpreter" when subinterpreters are available and "process" elsewhere.
+    """
+    if (max_workers or os.cpu_count() or 1) <= 1:
+        return "serial"
+    if free_threading_enabled():
+        return "thread"
+    if subinterpreters_available():
+        return "interpreter"
+    return "process"
+
+
+def create_executor(
+    kind: str, max_workers: Optional[int] = None
+) -> Optional[concurrent.futures.Executor]:
+    """
+    Creates an executor of the given kind.
+
+    Args:
+        kind (str): One of "serial", "thread", "interpreter" or "process".
+        max_workers (Optional[int]): The number of workers, defaults to the number of CPUs.
+
+    Returns:
+        Optional[concurrent.futures.Executor]: The executor, or None for serial execution.
+    """
+    if kind not in EXECUTOR_KINDS or kind == "auto":
+        raise ValueError(f"Unsupported executor kind: {kind}")
+    if kind == "serial":
+        return None
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if kind == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers)
+    if kind == "interpreter":
+        if subinterpreters_available():
+            return concurrent.futures.InterpreterPoolExecutor(max_workers)
+        logger.warning("Subinterpreters are not available, using processes instead")
+    return concurrent.futures.ProcessPoolExecutor(max_workers)
+
+
+def normalize_chunk(
+    rows: Sequence[Union[Tuple[str, str, float], Dict[str, Union[str, float]]]],
+) -> PartialRatings:
+    """
+    Normalizes a chunk of rating rows and keeps the latest rating of each member for each book.
+
+    Every distinct raw name is normalized only once per chunk.
+
+    Args:
+        rows (Sequence[Union[Tuple[str, str, float], Dict[str, Union[str, float]]]]): Rating rows or dictionaries
+            containing book ratings data.
+
+    Returns:
+        PartialRatings: The latest rating per (book title, member name), in first-seen order.
+    """
+    names: Dict[str, str] = {}
+    partial: PartialRatings = {}
+
+    for row in rows:
+        if isinstance(row, tuple):
+            book_title, member_name, rating = row
+        else:
+            book_title = row["book_title"]
+            member_name = row["member_name"]
+            rating = float(row["num_stars"])
+
+        normalized_title = names.get(book_title)
+        if normalized_title is None:
+            normalized_title = names[book_title] = Normalizer.normalize_name(book_title)
+        normalized_member = names.get(member_name)
+        if normalized_member is None:
+            normalized_member = names[member_name] = Normalizer.normalize_name(
+                member_name
+            )
+
+        partial[(normalized_title, normalized_member)] = rating
+
+    return partial
+
+
+def merge_partials(partials: Iterable[PartialRatings]) -> PartialRatings:
+    """
+    Merges chunk results in chunk order, so later ratings win exactly as they would when read serially.
+
+    Args:
+        partials (Iterable[PartialRatings]): The results of normalize_chunk, in chunk order.
+
+    Returns:
+        PartialRatings: The merged ratings.
+    """
+    merged: PartialRatings = {}
+    for partial in partials:
+        merged.update(partial)
+    return merged
+
+
+def iter_chunks(rows: Iterable, chunk_size: int) -> Iterator[List]:
+    """
+    Splits rows into lists of up to chunk_size rows, reading the rows lazily.
+
+    Args:
+        rows (Iterable): The rows to split, e.g. a streaming InputAdapter.iter_rows.
+        chunk_size (int): The number of rows per chunk.
+
+    Yields:
+        List: The next chunk.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_partials(
+    chunks: Iterator[List], kind: str, max_workers: Optional[int] = None
+) -> Iterator[PartialRatings]:
+    """
+    Normalizes chunks on an executor and yields the results in chunk order.
+
+    Chunks are submitted as they are produced, with at most two per worker in flight, so the input is never held
+    in memory at once.
+
+    Args:
+        chunks (Iterator[List]): The chunks to normalize, see iter_chunks.
+        kind (str): One of "serial", "thread", "interpreter" or "process".
+        max_workers (Optional[int]): The number of workers, defaults to the number of CPUs.
+
+    Yields:
+        PartialRatings: The result of normalize_chunk for each chunk.
+    """
+    executor = create_executor(kind, max_workers)
+    if executor is None:
+        yield from map(normalize_chunk, chunks)
+        return
+
+    max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    pending_chunks = collections.deque()
+    futures = collections.deque()
+    try:
+        with executor:
+            for chunk in chunks:
+                pending_chunks.append(chunk)
+                futures.append(executor.submit(normalize_chunk, chunk))
+                while len(futures) >= max_in_flight:
+                    yield futures[0].result()
+                    pending_chunks.popleft()
+                    futures.popleft()
+            while futures:
+                yield futures[0].result()
+                pending_chunks.popleft()
+                futures.popleft()
+    except Exception as error:
+        if kind != "interpreter":
+            raise
+        # subinterpreters cannot always import the modules of the main interpreter
+        logger.warning(f"Subinterpreter workers failed ({error}), using processes")
+        yield from iter_partials(
+            itertools.chain(pending_chunks, chunks), "process", max_workers
+        )
+
+
+def normalize_ratings(
+    rows: Iterable[Union[Tuple[str, str, float], Dict[str, Union[str, float]]]],
+    kind: str = "serial",
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> PartialRatings:
+    """
+    Normalizes rating rows in chunks, in parallel unless the kind is "serial".
+
+    The rows are read lazily, so streaming rows from InputAdapter.iter_rows are never all held in memory.
+
+    Args:
+        rows (Iterable[Union[Tuple[str, str, float], Dict[str, Union[str, float]]]]): Rating rows or dictionaries
+            containing book ratings data.
+        kind (str): The executor kind, see EXECUTOR_KINDS. "auto" runs small inputs serially and large inputs on
+            the default executor kind.
+        max_workers (Optional[int]): The number of workers, defaults to the number of CPUs.
+        chunk_size (int): The number of rows normalized per task.
+
+    Returns:
+        PartialRatings: The latest rating per (book title, member name), in first-seen order.
+    """
+    chunks = iter_chunks(rows, chunk_size)
+
+    if kind == "auto":
+        # look at the first two chunks to tell whether the input is large enough to parallelize
+        first_chunks = list(itertools.islice(chunks, 2))
+        kind = (
+            "serial" if len(first_chunks) <= 1 else default_executor_kind(max_workers)
+        )
+        chunks = itertools.chain(first_chunks, chunks)
+
+    return merge_partials(iter_partials(chunks, kind, max_workers))
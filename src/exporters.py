@@ -0,0 +1,226 @@
+import abc
+import csv
+import html
+import json
+import os
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+BookStats = Dict[str, Union[float, int]]
+
+FIELDS = ("book", "rating", "favorites", "least_favorites")
+HEADERS = ("Book", "Rating", "Favorites", "Least Favorites")
+
+
+class StatsExporter(abc.ABC):
+    """
+    Base class for writers that stream book statistics to a file one book at a time.
+
+    Use as a context manager and call `write` once per book.
+    """
+
+    newline: Optional[str] = None
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file = None
+
+    def __enter__(self) -> "StatsExporter":
+        self.file = open(self.file_path, "w", encoding="utf-8", newline=self.newline)
+        self.write_header()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if exc_info[0] is None:
+            self.write_footer()
+        self.file.close()
+
+    def write_header(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def write(self, book_title: str, book_stats: BookStats) -> None:
+        """
+        Writes the statistics of one book.
+        """
+
+    def write_footer(self) -> None:
+        pass
+
+
+class JSONLExporter(StatsExporter):
+    """
+    Writes one JSON object per book.
+    """
+
+    def write(self, book_title: str, book_stats: BookStats) -> None:
+        self.file.write(
+            json.dumps({"book": book_title, **book_stats}, ensure_ascii=False) + "\n"
+        )
+
+
+class CSVExporter(StatsExporter):
+    """
+    Writes a CSV file with a header row.
+    """
+
+    newline = ""
+
+    def write_header(self) -> None:
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(FIELDS)
+
+    def write(self, book_title: str, book_stats: BookStats) -> None:
+        self.writer.writerow([book_title, *(book_stats[key] for key in FIELDS[1:])])
+
+
+class MarkdownExporter(StatsExporter):
+    """
+    Writes a Markdown report with a table of book statistics.
+    """
+
+    def write_header(self) -> None:
+        self.file.write("# Book Club Statistics\n\n")
+        self.file.write("| " + " | ".join(HEADERS) + " |\n")
+        self.file.write("|" + "|".join(["---", "---:", "---:", "---:"]) + "|\n")
+
+    def write(self, book_title: str, book_stats: BookStats) -> None:
+        title = book_title.replace("|", "\\|")
+        values = [str(book_stats[key]) for key in FIELDS[1:]]
+        self.file.write("| " + " | ".join([title, *values]) + " |\n")
+
+
+class HTMLExporter(StatsExporter):
+    """
+    Writes a standalone HTML report with a table of book statistics.
+    """
+
+    def write_header(self) -> None:
+        self.file.write(
+            "<!DOCTYPE html>\n"
+            '<html lang="en">\n'
+            '<head>\n<meta charset="utf-8">\n<title>Book Club Statistics</title>\n'
+            "<style>table{border-collapse:collapse}"
+            "th,td{border:1px solid #ccc;padding:4px 8px}"
+            "td+td{text-align:right}</style>\n"
+            "</head>\n<body>\n<h1>Book Club Statistics</h1>\n<table>\n<thead><tr>"
+            + "".join(f"<th>{header}</th>" for header in HEADERS)
+            + "</tr></thead>\n<tbody>\n"
+        )
+
+    def write(self, book_title: str, book_stats: BookStats) -> None:
+        cells = [book_title, *(str(book_stats[key]) for key in FIELDS[1:])]
+        self.file.write(
+            "<tr>"
+            + "".join(f"<td>{html.escape(cell)}</td>" for cell in cells)
+            + "</tr>\n"
+        )
+
+    def write_footer(self) -> None:
+        self.file.write("</tbody>\n</table>\n</body>\n</html>\n")
+
+
+class ParquetExporter(StatsExporter):
+    """
+    Writes a Parquet file in row groups of `batch_size` books. Requires the optional pyarrow package.
+    """
+
+    def __init__(self, file_path: str, batch_size: int = 10_000):
+        super().__init__(file_path)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "Parquet export requires pyarrow, install it with 'pip install pyarrow'"
+            )
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema(
+            [
+                ("book", pyarrow.string()),
+                ("rating", pyarrow.float64()),
+                ("favorites", pyarrow.int64()),
+                ("least_favorites", pyarrow.int64()),
+            ]
+        )
+        self.batch_size = batch_size
+        self.batch = {field: [] for field in FIELDS}
+
+    def __enter__(self) -> "ParquetExporter":
+        self.file = self.pyarrow.parquet.ParquetWriter(self.file_path, self.schema)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if exc_info[0] is None:
+            self.flush()
+        self.file.close()
+
+    def write(self, book_title: str, book_stats: BookStats) -> None:
+        self.batch["book"].append(book_title)
+        for key in FIELDS[1:]:
+            self.batch[key].append(book_stats[key])
+        if len(self.batch["book"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.batch["book"]:
+            return
+        self.file.write_table(
+            self.pyarrow.Table.from_pydict(self.batch, schema=self.schema)
+        )
+        self.batch = {field: [] for field in FIELDS}
+
+
+EXPORTERS = {
+    "jsonl": JSONLExporter,
+    "csv": CSVExporter,
+    "parquet": ParquetExporter,
+    "md": MarkdownExporter,
+    "html": HTMLExporter,
+}
+
+
+def get_exporter(file_path: str, export_format: Optional[str] = None) -> StatsExporter:
+    """
+    Creates the exporter for a file, chosen by format name or by file extension.
+
+    Args:
+        file_path (str): The path to the output file.
+        export_format (Optional[str]): One of "jsonl", "csv", "parquet", "md" or "html". Defaults to the file
+            extension.
+
+    Returns:
+        StatsExporter: The exporter for the file.
+    """
+    if export_format is None:
+        export_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+        export_format = {"markdown": "md", "htm": "html"}.get(
+            export_format, export_format
+        )
+    if export_format not in EXPORTERS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    return EXPORTERS[export_format](file_path)
+
+
+def export_stats(
+    book_stats: Iterable[Tuple[str, BookStats]],
+    file_path: str,
+    export_format: Optional[str] = None,
+) -> int:
+    """
+    Streams book statistics to a file.
+
+    Args:
+        book_stats (Iterable[Tuple[str, BookStats]]): (book title, statistics) pairs, e.g. from
+            BookClubAggregator.iter_book_stats.
+        file_path (str): The path to the output file.
+        export_format (Optional[str]): The export format, defaults to the file extension.
+
+    Returns:
+        int: The number of books written.
+    """
+    num_books = 0
+    with get_exporter(file_path, export_format) as exporter:
+        for book_title, stats in book_stats:
+            exporter.write(book_title, stats)
+            num_books += 1
+    return num_books
@@ -0,0 +1,372 @@
+import abc
+import csv
+import itertools
+import json
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class RatingRow(NamedTuple):
+    """
+    A single validated rating read from an input file.
+    """
+
+    book_title: str
+    member_name: str
+    num_stars: float
+
+
+class RowError(NamedTuple):
+    """
+    A row that could not be loaded, with the reason it was rejected.
+    """
+
+    line_number: int
+    row: object
+    message: str
+
+
+COLUMN_ALIASES = {
+    "book_title": ("book_title", "book", "title", "book title"),
+    "member_name": ("member_name", "member", "name", "member name", "reader"),
+    "num_stars": ("num_stars", "stars", "rating", "num stars", "my rating"),
+}
+
+
+def parse_stars(value) -> float:
+    """
+    Parses and validates a star rating.
+
+    Args:
+        value: The raw rating value.
+
+    Returns:
+        float: The rating as a float between 0 and 5.
+
+    Raises:
+        ValueError: If the value is not a number between 0 and 5.
+    """
+    num_stars = float(value)
+    # NaN fails the comparison too
+    if not 0 <= num_stars <= 5:
+        raise ValueError(f"Rating must be between 0 and 5, got {value!r}")
+    return num_stars
+
+
+def parse_name(value, field: str) -> str:
+    """
+    Parses and validates a book title or member name.
+
+    Args:
+        value: The raw value. Numbers are accepted, e.g. a JSON title of 1984.
+        field (str): The name of the field, used in error messages.
+
+    Returns:
+        str: The value without surrounding whitespace.
+
+    Raises:
+        ValueError: If the value is empty or not a string or number.
+    """
+    if value is None:
+        value = ""
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    elif not isinstance(value, str):
+        raise ValueError(f"Invalid {field}: {value!r}")
+    value = value.strip()
+    if not value:
+        raise ValueError(f"Missing {field}")
+    return value
+
+
+def make_row(book_title, member_name, num_stars) -> RatingRow:
+    """
+    Builds a validated RatingRow from raw values.
+
+    Raises:
+        ValueError: If the title or member name is empty or invalid, or the rating is invalid.
+    """
+    return RatingRow(
+        parse_name(book_title, "book title"),
+        parse_name(member_name, "member name"),
+        parse_stars(num_stars),
+    )
+
+
+class InputAdapter(abc.ABC):
+    """
+    Base class for reading ratings from an input file into typed rows.
+
+    Rows that fail validation are collected in `errors` instead of aborting the load.
+    """
+
+    def __init__(self):
+        self.errors: List[RowError] = []
+
+    def iter_rows(self, file_path: str) -> Iterator[RatingRow]:
+        """
+        Streams validated rows from a file.
+
+        Args:
+            file_path (str): The path to the input file.
+
+        Yields:
+            RatingRow: The next valid row.
+        """
+        self.errors = []
+        with self.open(file_path) as f:
+            for line_number, raw in self.iter_raw(f):
+                row = self._decode(line_number, raw)
+                if row is not None:
+                    yield row
+
+    def read_rows(self, file_path: str) -> List[RatingRow]:
+        """
+        Reads all validated rows from a file at once.
+
+        Args:
+            file_path (str): The path to the input file.
+
+        Returns:
+            List[RatingRow]: The valid rows.
+        """
+        return list(self.iter_rows(file_path))
+
+    @staticmethod
+    def open(file_path: str):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        return open(file_path, "r", encoding="utf-8-sig", newline="")
+
+    @abc.abstractmethod
+    def iter_raw(self, f) -> Iterator[Tuple[int, object]]:
+        """
+        Yields (line number, raw record) pairs from an open file.
+        """
+
+    @abc.abstractmethod
+    def to_row(self, raw) -> RatingRow:
+        """
+        Validates a raw record, raising ValueError, TypeError, KeyError or IndexError if it is invalid.
+        """
+
+    def _decode(self, line_number: int, raw) -> Optional[RatingRow]:
+        try:
+            return self.to_row(raw)
+        except (ValueError, TypeError, KeyError, IndexError) as error:
+            self.errors.append(RowError(line_number, raw, str(error)))
+            return None
+
+
+class CSVAdapter(InputAdapter):
+    """
+    Reads delimited files with either no header (title, member, stars) or a header row naming the columns.
+    """
+
+    delimiter = ","
+
+    def __init__(self):
+        super().__init__()
+        self.columns = (0, 1, 2)
+
+    def iter_rows(self, file_path: str) -> Iterator[RatingRow]:
+        """
+        Streams validated rows from a file.
+
+        Valid rows are checked inline; only rejected rows go through to_row again to report the reason.
+
+        Args:
+            file_path (str): The path to the input file.
+
+        Yields:
+            RatingRow: The next valid row.
+        """
+        self.errors = []
+        with self.open(file_path) as f:
+            raw_rows = self.iter_raw(f)
+            title_column, member_column, stars_column = self.columns
+            # tuple.__new__ skips the Python-level RatingRow constructor
+            new_row = tuple.__new__
+            for line_number, raw in raw_rows:
+                try:
+                    book_title = raw[title_column].strip()
+                    member_name = raw[member_column].strip()
+                    num_stars = float(raw[stars_column])
+                except (IndexError, ValueError):
+                    book_title = None
+                if book_title and member_name and 0 <= num_stars <= 5:
+                    yield new_row(RatingRow, (book_title, member_name, num_stars))
+                elif any(cell.strip() for cell in raw):
+                    self._decode(line_number, raw)
+
+    def iter_raw(self, f) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Returns the (line number, row) pairs of an open file, detecting the header and setting `columns` first.
+        """
+        reader = csv.reader(f, delimiter=self.delimiter)
+        first_row = next(reader, None)
+        header = self.detect_header(first_row) if first_row else None
+        self.columns = header or (0, 1, 2)
+
+        raw_rows = enumerate(reader, start=2)
+        if first_row is not None and header is None:
+            raw_rows = itertools.chain([(1, first_row)], raw_rows)
+        return raw_rows
+
+    @staticmethod
+    def detect_header(row: List[str]) -> Optional[Tuple[int, int, int]]:
+        """
+        Detects whether a row is a header and, if so, maps it to column positions.
+
+        Args:
+            row (List[str]): The first row of the file.
+
+        Returns:
+            Optional[Tuple[int, int, int]]: The positions of the title, member and stars columns, or None if the
+                row is not a recognized header.
+        """
+        names = [cell.strip().lower() for cell in row]
+        positions = []
+        for field in RatingRow._fields:
+            position = next(
+                (i for i, name in enumerate(names) if name in COLUMN_ALIASES[field]),
+                None,
+            )
+            positions.append(position)
+
+        if None in positions:
+            return None
+        return tuple(positions)
+
+    def to_row(self, raw: List[str]) -> RatingRow:
+        title_column, member_column, stars_column = self.columns
+        return make_row(raw[title_column], raw[member_column], raw[stars_column])
+
+
+class TSVAdapter(CSVAdapter):
+    """
+    Reads tab-separated files, with or without a header row.
+    """
+
+    delimiter = "\t"
+
+
+class JSONLAdapter(InputAdapter):
+    """
+    Reads JSON Lines files with one object per line holding book_title, member_name and num_stars.
+    """
+
+    def iter_raw(self, f) -> Iterator[Tuple[int, object]]:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as error:
+                self.errors.append(RowError(line_number, line, str(error)))
+
+    def read_rows(self, file_path: str) -> List[RatingRow]:
+        self.errors = []
+        with self.open(file_path) as f:
+            lines = [
+                (line_number, line)
+                for line_number, line in enumerate(f, start=1)
+                if line.strip()
+            ]
+
+        try:
+            # decode the whole file in a single call, and only go line by line if it is malformed
+            records = json.loads("[" + ",".join(line for _, line in lines) + "]")
+        except json.JSONDecodeError:
+            return list(self.iter_rows(file_path))
+        if len(records) != len(lines):
+            return list(self.iter_rows(file_path))
+
+        rows = []
+        for (line_number, _), record in zip(lines, records):
+            row = self._decode(line_number, record)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def to_row(self, raw: Dict) -> RatingRow:
+        return make_row(raw["book_title"], raw["member_name"], raw["num_stars"])
+
+
+class GoodreadsAdapter(InputAdapter):
+    """
+    Reads a Goodreads library export for a single member. Books without a rating ("My Rating" of 0) are skipped.
+    """
+
+    def __init__(self, member_name: str):
+        super().__init__()
+        if not member_name or not member_name.strip():
+            raise ValueError("A member name is required for Goodreads exports")
+        self.member_name = member_name
+
+    def iter_raw(self, f) -> Iterator[Tuple[int, Dict[str, str]]]:
+        reader = csv.DictReader(f)
+        missing = {"Title", "My Rating"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Not a Goodreads export, missing columns: {missing}")
+        for line_number, row in enumerate(reader, start=2):
+            # short rows have None for the missing columns, to_row reports them as bad rows
+            rating = row.get("My Rating")
+            if rating is not None and rating.strip() in ("", "0"):
+                continue
+            yield line_number, row
+
+    def to_row(self, raw: Dict[str, str]) -> RatingRow:
+        return make_row(raw["Title"], self.member_name, raw["My Rating"])
+
+
+ADAPTERS = {
+    "csv": CSVAdapter,
+    "tsv": TSVAdapter,
+    "jsonl": JSONLAdapter,
+    "goodreads": GoodreadsAdapter,
+}
+
+
+def get_adapter(
+    file_path: str, input_format: Optional[str] = None, **kwargs
+) -> InputAdapter:
+    """
+    Creates the input adapter for a file, chosen by format name or by file extension.
+
+    Args:
+        file_path (str): The path to the input file.
+        input_format (Optional[str]): One of "csv", "tsv", "jsonl" or "goodreads". Defaults to the file extension,
+            or "csv" for other extensions.
+        **kwargs: Arguments passed to the adapter, e.g. member_name for Goodreads exports.
+
+    Returns:
+        InputAdapter: The adapter for the file.
+    """
+    if input_format is None:
+        extension = os.path.splitext(file_path)[1].lstrip(".").lower()
+        extension = "jsonl" if extension == "ndjson" else extension
+        # files with other extensions, e.g. .txt, are read as CSV like before
+        input_format = extension if extension in ("csv", "tsv", "jsonl") else "csv"
+    if input_format not in ADAPTERS:
+        raise ValueError(f"Unsupported input format: {input_format}")
+    return ADAPTERS[input_format](**kwargs)
+
+
+def read_ratings(
+    file_path: str, input_format: Optional[str] = None, **kwargs
+) -> Tuple[List[RatingRow], List[RowError]]:
+    """
+    Reads all ratings from a file, collecting rows that could not be loaded.
+
+    Args:
+        file_path (str): The path to the input file.
+        input_format (Optional[str]): The input format, defaults to the file extension.
+        **kwargs: Arguments passed to the adapter.
+
+    Returns:
+        Tuple[List[RatingRow], List[RowError]]: The valid rows and the rejected rows.
+    """
+    adapter = get_adapter(file_path, input_format, **kwargs)
+    rows = adapter.read_rows(file_path)
+    return rows, adapter.errors
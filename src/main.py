@@ -7,58 +7,182 @@ from dotenv import load_dotenv
 
 from book_club_aggregator import BookClubAggregator
 from book_manager import BookManager
-from csv_reader import CSVReader
+from exporters import export_stats
+from input_adapters import read_ratings
 from notion_db_API import NotionDBAPI
+from ratings_store import RatingsStore
+from sync_journal import SyncJournal
+from sync_planner import ChangePlan, SyncPlanner
 
 
-async def main(ratings_file: str = None):
+async def main(
+    ratings_file: str = None,
+    journal_file: str = None,
+    input_format: str = None,
+    member_name: str = None,
+    store_file: str = None,
+    window: str = None,
+    plan_file: str = None,
+    apply_plan_file: str = None,
+    archive_orphans: bool = False,
+    executor: str = "auto",
+    export_files: list = None,
+    offline: bool = False,
+):
     load_dotenv()
 
     print("Initializing the Book Club Aggregator...")
 
-    if ratings_file is None:
-        # Get the current file directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
+    if apply_plan_file is not None:
+        await apply_saved_plan(apply_plan_file, journal_file)
+        return
+
+    # Get the current file directory
+    current_dir = os.path.dirname(os.path.abspath(__file__))
 
-        # Navigate up one level
-        parent_dir = os.path.dirname(current_dir)
+    # Navigate up one level
+    parent_dir = os.path.dirname(current_dir)
 
+    if ratings_file is None:
         # Define the file path for CSV data
         file_path = os.path.join(os.path.join(parent_dir, "data"), "ratings.csv")
     else:
         file_path = ratings_file
 
-    print(f"Reading data from CSV file: '{file_path}'")
+    if journal_file is None:
+        # Define the file path for the sync journal
+        journal_file = default_journal_file()
+
+    if store_file is None:
+        # Define the file path for the ratings history
+        store_file = os.path.join(os.path.join(parent_dir, "data"), "ratings.sqlite3")
+
+    print(f"Reading data from file: '{file_path}'")
 
-    # Read data from the CSV file
-    book_data = CSVReader.read_data(file_path)
-    print("Data successfully loaded from the CSV file.")
+    # Read data from the ratings file
+    adapter_kwargs = {}
+    if input_format == "goodreads":
+        adapter_kwargs["member_name"] = member_name
+    elif member_name:
+        print("Ignoring the member name, it is only used for Goodreads exports.")
+    book_data, bad_rows = read_ratings(file_path, input_format, **adapter_kwargs)
+    print(f"Data successfully loaded from the file: {len(book_data)} ratings.")
+
+    # Report rows that could not be loaded
+    for bad_row in bad_rows:
+        print(f"Skipped line {bad_row.line_number}: {bad_row.message}")
     print()
 
-    # Create a BookClubAggregator instance
-    book_club_aggregator = BookClubAggregator(book_data)
+    # Create a BookClubAggregator instance, recording the ratings in the history unless this is a dry run
+    dry_run = plan_file is not None
+    ratings_store = RatingsStore(store_file)
+    book_club_aggregator = BookClubAggregator(
+        book_data, store=None if dry_run else ratings_store, executor=executor
+    )
 
     # Display statistics
     print("Calculating and displaying statistics:")
     book_club_aggregator.display_stats()
     print()
 
+    # Display statistics for ratings made within the time window
+    if window is not None:
+        print(f"Statistics for ratings made this {window}:")
+        book_club_aggregator.display_stats(
+            ratings_store.book_stats(*RatingsStore.window(window))
+        )
+        print()
+    ratings_store.close()
+
+    # Export statistics, streaming them book by book
+    for export_file in export_files or []:
+        num_books = export_stats(book_club_aggregator.iter_book_stats(), export_file)
+        print(f"Exported statistics for {num_books} books to: '{export_file}'")
+
+    if offline:
+        print("Offline mode, the Notion database was not updated.")
+        return
+
     # Aggregate book statistics
     ratings_new = book_club_aggregator.aggregate_book_stats()
     print("Book statistics aggregated successfully.")
 
-    # Create a book manager instance to interact with the Notion database
-    book_manager = BookManager(api=NotionDBAPI())
+    # Create a book manager instance to interact with the Notion database, a dry run only reads from it
+    book_manager = BookManager(
+        api=NotionDBAPI(), journal=None if dry_run else SyncJournal(journal_file)
+    )
     print("Connected to the Notion database.")
 
-    # Get existing ratings from the Notion database
-    ratings_existing = await book_manager.get_existing_ratings()
-    print("Retrieved existing ratings from the Notion database.")
+    # Resume an interrupted sync of the same ratings, if there is one
+    if not dry_run and await book_manager.resume_sync(SyncJournal.digest(ratings_new)):
+        print(f"Resumed an interrupted sync from the journal: '{journal_file}'")
+    else:
+        # Get existing ratings from the Notion database
+        ratings_existing = await book_manager.get_existing_ratings()
+        print("Retrieved existing ratings from the Notion database.")
+
+        # Plan the changes to the Notion database
+        plan = SyncPlanner.plan(ratings_new, ratings_existing, archive_orphans)
+        print(f"Planned changes: {plan.summary()}")
 
-    print("Updating the Notion database...")
+        if dry_run:
+            # Save the plan for review instead of applying it
+            plan.save(plan_file)
+            print(f"Dry run, plan saved to: '{plan_file}'")
+            return
 
-    # Update the Notion database
-    await book_manager.upsert_books_to_database(ratings_new, ratings_existing)
+        print("Updating the Notion database...")
+
+        # Update the Notion database
+        await book_manager.apply_plan(plan)
+
+    print("Notion database updated.")
+
+    print("All Done! 🎊")
+
+
+def default_journal_file() -> str:
+    # Navigate up one level from the current file directory
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    # Define the file path for the sync journal
+    return os.path.join(os.path.join(parent_dir, "data"), "sync_journal.jsonl")
+
+
+async def apply_saved_plan(plan_file: str, journal_file: str = None):
+    # Load a plan saved by a dry run
+    plan = ChangePlan.load(plan_file)
+    print(f"Loaded plan from '{plan_file}': {plan.summary()}")
+
+    # Journal the plan as saved, even if some of its changes are dropped below
+    plan_digest = plan.plan_digest
+    journal_file = journal_file or default_journal_file()
+    journal = SyncJournal(journal_file)
+
+    # Applying a plan twice would create its pages twice
+    if journal.has_finished(plan_digest):
+        print(
+            f"This plan was already applied, see the journal: '{journal_file}'. "
+            "Run --dry_run again to plan new changes."
+        )
+        return
+
+    book_manager = BookManager(api=NotionDBAPI(), journal=journal)
+    print("Connected to the Notion database.")
+
+    # Resume the plan if it was interrupted, otherwise apply it
+    if await book_manager.resume_sync(plan_digest):
+        print(f"Resumed an interrupted sync from the journal: '{journal_file}'")
+    else:
+        # Drop changes that no longer match the Notion database, e.g. after a sync since the dry run
+        ratings_existing = await book_manager.get_existing_ratings()
+        plan, skipped = SyncPlanner.revalidate(plan, ratings_existing)
+        for message in skipped:
+            print(f"Skipped {message}")
+        print(f"Changes still to apply: {plan.summary()}")
+
+        print("Updating the Notion database...")
+        await book_manager.apply_plan(plan, plan_digest)
 
     print("Notion database updated.")
 
@@ -78,8 +202,112 @@ if __name__ == "__main__":
         default=None,
     )
 
+    # Add an optional argument to specify the format of the ratings file
+    parser.add_argument(
+        "--input_format",
+        help="Input ratings file format (default: from the file extension)",
+        choices=["csv", "tsv", "jsonl", "goodreads"],
+        default=None,
+    )
+
+    # Add an optional argument to specify the member of a Goodreads export
+    parser.add_argument(
+        "--member_name",
+        help="Member whose ratings a Goodreads export contains (required for 'goodreads')",
+        default=None,
+    )
+
+    # Add an optional argument to specify how ratings are normalized
+    parser.add_argument(
+        "--executor",
+        help="Executor used to normalize ratings (default: 'auto', parallel for large files)",
+        choices=["auto", "serial", "thread", "interpreter", "process"],
+        default="auto",
+    )
+
+    # Add an optional argument to specify the ratings history file
+    parser.add_argument(
+        "--store_path",
+        help="Ratings history database (default: 'data/ratings.sqlite3')",
+        default=None,
+    )
+
+    # Add an optional argument to display statistics for a time window
+    parser.add_argument(
+        "--window",
+        help="Also display statistics for ratings made this month or year",
+        choices=["month", "year"],
+        default=None,
+    )
+
+    # Add an optional argument to export statistics to files
+    parser.add_argument(
+        "--export",
+        metavar="EXPORT_PATH",
+        help="Export statistics to a .jsonl, .csv, .parquet, .md or .html file (can be repeated)",
+        action="append",
+        default=None,
+    )
+
+    # Add an optional argument to skip the Notion database
+    parser.add_argument(
+        "--offline",
+        help="Only display and export statistics, without connecting to Notion",
+        action="store_true",
+    )
+
+    # Add an optional argument to plan the sync without applying it
+    parser.add_argument(
+        "--dry_run",
+        metavar="PLAN_PATH",
+        help="Save the planned changes to this JSON file instead of updating the Notion database",
+        default=None,
+    )
+
+    # Add an optional argument to apply a plan saved by a dry run
+    parser.add_argument(
+        "--apply_plan",
+        metavar="PLAN_PATH",
+        help="Apply a plan saved with --dry_run instead of reading a ratings file",
+        default=None,
+    )
+
+    # Add an optional argument to archive books that are no longer rated
+    parser.add_argument(
+        "--archive_orphans",
+        help="Archive Notion entries for books that are not in the ratings file",
+        action="store_true",
+    )
+
+    # Add an optional argument to specify the sync journal file
+    parser.add_argument(
+        "--journal_path",
+        help="Sync journal file used to resume interrupted syncs (default: 'data/sync_journal.jsonl')",
+        default=None,
+    )
+
     # Parse the command-line arguments
     args = parser.parse_args()
 
+    if args.input_format == "goodreads" and not args.member_name:
+        parser.error("--member_name is required with --input_format goodreads")
+    if args.offline and (args.dry_run or args.apply_plan):
+        parser.error("--offline cannot be combined with --dry_run or --apply_plan")
+
     # Call the main function with the ratings file argument
-    asyncio.run(main(args.csv_path))
+    asyncio.run(
+        main(
+            args.csv_path,
+            args.journal_path,
+            args.input_format,
+            args.member_name,
+            args.store_path,
+            args.window,
+            args.dry_run,
+            args.apply_plan,
+            args.archive_orphans,
+            args.executor,
+            args.export,
+            args.offline,
+        )
+    )
@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict
+from typing import AsyncIterator, Dict, List, Optional
 
 from dotenv import load_dotenv
 from notion_client import AsyncClient
@@ -14,6 +14,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Notion allows an average of three requests per second per integration
+NOTION_REQUESTS_PER_SECOND = 3
+
 retry_decorator = retry(
     wait=wait_fixed(1),
     stop=stop_after_attempt(5),
@@ -35,20 +38,68 @@ class NotionDBAPI:
         self.database_id = database_id or os.getenv("NOTION_DATABASE_ID")
 
     @retry_decorator
-    async def query_database(self):
+    async def query_database(
+        self,
+        start_cursor: Optional[str] = None,
+        filter_properties: Optional[List[str]] = None,
+    ):
         """
         Query the Notion database.
 
+        Args:
+            start_cursor (str): The cursor to continue a paginated query from.
+            filter_properties (List[str]): IDs of the page properties to return. All properties are returned if not provided.
+
         Returns:
             dict: The query result from the Notion database.
         """
-        return await self.notion.databases.query(database_id=self.database_id)
+        if not filter_properties:
+            return await self.notion.databases.query(
+                database_id=self.database_id, start_cursor=start_cursor
+            )
+
+        # notion-client does not expose filter_properties, which is a query string parameter
+        body = {"start_cursor": start_cursor} if start_cursor else {}
+        return await self.notion.request(
+            path=f"databases/{self.database_id}/query",
+            method="POST",
+            query={"filter_properties": list(filter_properties)},
+            body=body,
+        )
+
+    @retry_decorator
+    async def find_pages_by_title(self, title: str):
+        """
+        Query the Notion database for pages with the given title.
+
+        Args:
+            title (str): The exact title to look for.
+
+        Returns:
+            List[dict]: The matching Notion pages.
+        """
+        response = await self.notion.databases.query(
+            database_id=self.database_id,
+            filter={"property": "Book Title", "title": {"equals": title}},
+        )
+        return response["results"]
 
     @retry_decorator
+    async def retrieve_database(self):
+        """
+        Retrieve the Notion database object, including its property schema.
+
+        Returns:
+            dict: The Notion database.
+        """
+        return await self.notion.databases.retrieve(database_id=self.database_id)
+
     async def add_page(self, properties: Dict):
         """
         Add a new page to the Notion database with the specified properties.
 
+        Not retried here: page creation is not idempotent, see BookManager.create_page.
+
         Args:
             properties (dict): A dictionary of property values for the new page.
 
@@ -99,14 +150,29 @@ class NotionDBAPI:
             List[Dict]: All results combined from paginated responses.
         """
         all_results = []
+        async for results in NotionDBAPI.iter_paginated_results(api_call, **kwargs):
+            all_results.extend(results)
+
+        return all_results
+
+    @staticmethod
+    async def iter_paginated_results(api_call, **kwargs) -> AsyncIterator[List[Dict]]:
+        """
+        Yield paginated results from a given API call one response at a time.
+
+        Args:
+            api_call (function): The API call to fetch results.
+            **kwargs: Arguments to be passed to the API call.
+
+        Yields:
+            List[Dict]: The results of a single paginated response.
+        """
         next_cursor = None
 
         while True:
             response = await api_call(start_cursor=next_cursor, **kwargs)
-            all_results.extend(response["results"])
+            yield response["results"]
 
             next_cursor = response.get("next_cursor")
             if not next_cursor:
                 break
-
-        return all_results
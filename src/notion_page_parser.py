@@ -0,0 +1,114 @@
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Union
+
+from normalizer import Normalizer
+
+logger = logging.getLogger(__name__)
+
+
+TITLE_PROPERTY = "Book Title"
+NUMBER_PROPERTIES = {
+    "rating": "Rating",
+    "favorites": "Favorites",
+    "least_favorites": "Least Favorites",
+}
+BOOK_PROPERTIES = [TITLE_PROPERTY, *NUMBER_PROPERTIES.values()]
+
+
+@lru_cache(maxsize=None)
+def _normalize_title(title: str) -> str:
+    return Normalizer.normalize_name(title)
+
+
+class NotionPageParser:
+    """
+    A utility class for extracting book entries from Notion page objects.
+    """
+
+    @staticmethod
+    def parse_title(properties: Dict) -> Optional[str]:
+        """
+        Extracts the book title from the properties of a Notion page.
+
+        Args:
+            properties (Dict): The "properties" object of a Notion page.
+
+        Returns:
+            Optional[str]: The normalized title, or None if the title is missing or empty.
+        """
+        segments = (properties.get(TITLE_PROPERTY) or {}).get("title") or []
+        title = "".join(
+            segment.get("plain_text")
+            or (segment.get("text") or {}).get("content")
+            or ""
+            for segment in segments
+        )
+        if not title.strip():
+            return None
+        return _normalize_title(title)
+
+    @staticmethod
+    def parse_page(page: Dict) -> Optional[Dict[str, Union[str, float, None]]]:
+        """
+        Extracts a single book entry from a Notion page.
+
+        Missing number properties are returned as None rather than raising.
+
+        Args:
+            page (Dict): A Notion page object.
+
+        Returns:
+            Optional[Dict[str, Union[str, float, None]]]: The book entry, or None if the page has no usable title.
+        """
+        properties = page.get("properties") or {}
+        book_title = NotionPageParser.parse_title(properties)
+        if book_title is None:
+            logger.warning(f"Skipping page without a title: {page.get('id')}")
+            return None
+
+        entry = {"book": book_title, "pageId": page.get("id")}
+        for key, property_name in NUMBER_PROPERTIES.items():
+            entry[key] = (properties.get(property_name) or {}).get("number")
+        return entry
+
+    @staticmethod
+    def parse_pages(
+        pages: Iterable[Dict],
+        existing_book_entries: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, Dict[str, Union[str, float, None]]]:
+        """
+        Extracts book entries from a batch of Notion pages.
+
+        Args:
+            pages (Iterable[Dict]): A batch of Notion page objects.
+            existing_book_entries (Optional[Dict[str, Dict]]): Entries from previous batches to add to.
+
+        Returns:
+            Dict[str, Dict[str, Union[str, float, None]]]: A dictionary mapping book titles to book entries.
+        """
+        if existing_book_entries is None:
+            existing_book_entries = {}
+
+        for page in pages:
+            entry = NotionPageParser.parse_page(page)
+            if entry is None:
+                continue
+            book_title = entry.pop("book")
+            existing_book_entries[book_title] = entry
+        return existing_book_entries
+
+    @staticmethod
+    def property_ids(database: Dict, names: List[str] = BOOK_PROPERTIES) -> List[str]:
+        """
+        Looks up the IDs of the given properties in a Notion database object.
+
+        Args:
+            database (Dict): A Notion database object.
+            names (List[str]): The property names to look up.
+
+        Returns:
+            List[str]: The IDs of the properties that exist in the database.
+        """
+        schema = database.get("properties") or {}
+        return [schema[name]["id"] for name in names if "id" in schema.get(name, {})]
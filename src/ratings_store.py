@@ -0,0 +1,287 @@
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from input_adapters import RatingRow
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratings (
+    id INTEGER PRIMARY KEY,
+    book_title TEXT NOT NULL,
+    member_name TEXT NOT NULL,
+    num_stars REAL NOT NULL,
+    rated_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ratings_rated_at ON ratings (rated_at);
+CREATE INDEX IF NOT EXISTS ratings_book_rated_at ON ratings (book_title, rated_at);
+CREATE INDEX IF NOT EXISTS ratings_book_member_rated_at
+    ON ratings (book_title, member_name, rated_at);
+CREATE TABLE IF NOT EXISTS latest_ratings (
+    book_title TEXT NOT NULL,
+    member_name TEXT NOT NULL,
+    num_stars REAL NOT NULL,
+    rated_at INTEGER NOT NULL,
+    PRIMARY KEY (book_title, member_name)
+) WITHOUT ROWID;
+"""
+
+# latest rating of each member for each book within [:start, :end)
+LATEST_RATINGS = """
+SELECT book_title, member_name, num_stars FROM (
+    SELECT book_title, member_name, num_stars, ROW_NUMBER() OVER (
+        PARTITION BY book_title, member_name ORDER BY rated_at DESC, id DESC
+    ) AS position
+    FROM ratings
+    WHERE rated_at >= :start AND rated_at < :end
+)
+WHERE position = 1
+"""
+
+# fills latest_ratings for databases created before it existed
+BACKFILL_LATEST_RATINGS = """
+INSERT INTO latest_ratings (book_title, member_name, num_stars, rated_at)
+SELECT book_title, member_name, num_stars, rated_at FROM (
+    SELECT book_title, member_name, num_stars, rated_at, ROW_NUMBER() OVER (
+        PARTITION BY book_title, member_name ORDER BY rated_at DESC, id DESC
+    ) AS position
+    FROM ratings
+)
+WHERE position = 1
+"""
+
+# later ratings replace the latest rating, backfilled older ones do not
+UPSERT_LATEST_RATING = """
+INSERT INTO latest_ratings (book_title, member_name, num_stars, rated_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (book_title, member_name) DO UPDATE
+SET num_stars = excluded.num_stars, rated_at = excluded.rated_at
+WHERE excluded.rated_at >= latest_ratings.rated_at
+"""
+
+BOOK_STATS = """
+SELECT
+    book_title,
+    AVG(num_stars),
+    SUM(num_stars = 5),
+    SUM(num_stars = 0)
+FROM ({ratings})
+GROUP BY book_title
+ORDER BY book_title
+"""
+
+MAX_TIMESTAMP = 2**63 - 1
+
+Window = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def _timestamp(moment: Optional[datetime], default: int) -> int:
+    if moment is None:
+        return default
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+class RatingsStore:
+    """
+    An append-only SQLite store of timestamped ratings.
+
+    A rating is only appended when it differs from the member's latest rating of the book, so loading the same
+    ratings again does not add history, while re-ratings are kept instead of overwriting the previous rating.
+    The latest rating per book and member is kept in its own table, so loads and all-time stats do not scan the
+    history.
+    """
+
+    def __init__(self, file_path: str = ":memory:"):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(file_path)
+        self.connection.executescript(SCHEMA)
+        with self.connection:
+            (has_latest,) = self.connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM latest_ratings)"
+            ).fetchone()
+            if not has_latest:
+                self.connection.execute(BACKFILL_LATEST_RATINGS)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @staticmethod
+    def window(period: str, now: Optional[datetime] = None) -> Window:
+        """
+        Returns the current calendar window for a period.
+
+        Args:
+            period (str): "month", "year" or "all".
+            now (Optional[datetime]): The moment to compute the window for, defaults to the current UTC time.
+
+        Returns:
+            Window: The (start, end) of the window. Either bound may be None for an open window.
+        """
+        now = now or datetime.now(timezone.utc)
+        if period == "all":
+            return None, None
+        if period == "month":
+            start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            if start.month == 12:
+                end = start.replace(year=start.year + 1, month=1)
+            else:
+                end = start.replace(month=start.month + 1)
+            return start, end
+        if period == "year":
+            start = now.replace(
+                month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+            )
+            return start, start.replace(year=start.year + 1)
+        raise ValueError(f"Unsupported period: {period}")
+
+    @staticmethod
+    def previous_window(period: str, now: Optional[datetime] = None) -> Window:
+        """
+        Returns the calendar window before the current one, e.g. last month.
+
+        Args:
+            period (str): "month" or "year".
+            now (Optional[datetime]): The moment to compute the window for, defaults to the current UTC time.
+
+        Returns:
+            Window: The (start, end) of the previous window.
+        """
+        start, _ = RatingsStore.window(period, now)
+        if start is None:
+            raise ValueError("The 'all' period has no previous window")
+        if period == "month":
+            if start.month == 1:
+                previous_start = start.replace(year=start.year - 1, month=12)
+            else:
+                previous_start = start.replace(month=start.month - 1)
+        else:
+            previous_start = start.replace(year=start.year - 1)
+        return previous_start, start
+
+    def latest_ratings(self) -> Dict[Tuple[str, str], float]:
+        """
+        Returns the latest rating of every member for every book.
+
+        Returns:
+            Dict[Tuple[str, str], float]: A dictionary mapping (book title, member name) to the number of stars.
+        """
+        rows = self.connection.execute(
+            "SELECT book_title, member_name, num_stars FROM latest_ratings"
+        )
+        return {(book, member): num_stars for book, member, num_stars in rows}
+
+    def add_ratings(
+        self,
+        rows: Iterable[Union[RatingRow, Tuple[str, str, float]]],
+        rated_at: Optional[datetime] = None,
+    ) -> int:
+        """
+        Appends the ratings that changed since the latest stored rating.
+
+        Args:
+            rows (Iterable[Union[RatingRow, Tuple[str, str, float]]]): Normalized (book title, member name, stars) rows.
+            rated_at (Optional[datetime]): When the ratings were made, defaults to the current UTC time.
+
+        Returns:
+            int: The number of ratings appended.
+        """
+        timestamp = _timestamp(rated_at, int(datetime.now(timezone.utc).timestamp()))
+        latest = self.latest_ratings()
+
+        new_rows = []
+        for book_title, member_name, num_stars in rows:
+            key = (book_title, member_name)
+            if latest.get(key) == num_stars:
+                continue
+            latest[key] = num_stars
+            new_rows.append((book_title, member_name, num_stars, timestamp))
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO ratings (book_title, member_name, num_stars, rated_at)"
+                " VALUES (?, ?, ?, ?)",
+                new_rows,
+            )
+            self.connection.executemany(UPSERT_LATEST_RATING, new_rows)
+        return len(new_rows)
+
+    def book_stats(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Union[float, int]]]:
+        """
+        Aggregates statistics for books from the latest rating of each member within a time window.
+
+        Args:
+            start (Optional[datetime]): The inclusive start of the window, unbounded if None.
+            end (Optional[datetime]): The exclusive end of the window, unbounded if None.
+
+        Returns:
+            Dict[str, Dict[str, Union[float, int]]]: A dictionary mapping book names to dictionaries containing
+                book statistics, in the same shape as BookClubAggregator.aggregate_book_stats.
+        """
+        if start is None and end is None:
+            rows = self.connection.execute(
+                BOOK_STATS.format(
+                    ratings="SELECT num_stars, book_title FROM latest_ratings"
+                )
+            )
+        else:
+            rows = self.connection.execute(
+                BOOK_STATS.format(ratings=LATEST_RATINGS),
+                {"start": _timestamp(start, 0), "end": _timestamp(end, MAX_TIMESTAMP)},
+            )
+        return {
+            book_title: {
+                "rating": round(avg_rating, 1),
+                "favorites": num_favorites,
+                "least_favorites": num_least_favorites,
+            }
+            for book_title, avg_rating, num_favorites, num_least_favorites in rows
+        }
+
+    def rating_history(self, book_title: str) -> List[Tuple[str, float, datetime]]:
+        """
+        Returns every rating ever given to a book, oldest first.
+
+        Args:
+            book_title (str): The normalized book title.
+
+        Returns:
+            List[Tuple[str, float, datetime]]: (member name, stars, rated at) for each rating.
+        """
+        rows = self.connection.execute(
+            "SELECT member_name, num_stars, rated_at FROM ratings"
+            " WHERE book_title = ? ORDER BY rated_at, id",
+            (book_title,),
+        )
+        return [
+            (member_name, num_stars, datetime.fromtimestamp(rated_at, timezone.utc))
+            for member_name, num_stars, rated_at in rows
+        ]
+
+    def trend(
+        self, current: Window, previous: Window
+    ) -> Dict[str, Dict[str, Union[float, int, None]]]:
+        """
+        Compares book statistics between two time windows.
+
+        Args:
+            current (Window): The (start, end) of the current window.
+            previous (Window): The (start, end) of the window to compare against.
+
+        Returns:
+            Dict[str, Dict[str, Union[float, int, None]]]: For each book rated in the current window, the change of
+                each statistic. Changes are None for books that were not rated in the previous window.
+        """
+        current_stats = self.book_stats(*current)
+        previous_stats = self.book_stats(*previous)
+
+        deltas = {}
+        for book_title, stats in current_stats.items():
+            before = previous_stats.get(book_title)
+            deltas[book_title] = {
+                key: None if before is None else round(value - before[key], 1)
+                for key, value in stats.items()
+            }
+        return deltas
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+BEGUN = "begun"
+PLANNED = "planned"
+STARTED = "started"
+DONE = "done"
+FINISHED = "finished"
+
+
+class SyncJournal:
+    """
+    An append-only journal of planned and completed Notion operations.
+
+    Each line of the journal file is a JSON event. Operations are keyed by run, operation type and book
+    title, so an interrupted sync can be resumed from the last acknowledged operation.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.runs: Dict[str, str] = {}
+        self.operations: Dict[str, Dict] = {}
+        self.states: Dict[str, str] = {}
+        self.finished_runs = set()
+        self._load()
+
+    @staticmethod
+    def digest(new_ratings: Dict[str, Dict]) -> str:
+        """
+        Computes a digest of the ratings being synced, so a rerun with the same input can be matched to its run.
+
+        Args:
+            new_ratings (Dict[str, Dict]): Dictionary containing new ratings.
+
+        Returns:
+            str: The digest of the ratings.
+        """
+        payload = json.dumps(new_ratings, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_key(run_id: str, operation: str, book_title: str) -> str:
+        """
+        Builds the idempotency key of an operation.
+
+        Args:
+            run_id (str): The run the operation belongs to.
+            operation (str): The operation type, "create", "update" or "archive".
+            book_title (str): The title of the book.
+
+        Returns:
+            str: The idempotency key.
+        """
+        return f"{run_id}:{operation}:{book_title}"
+
+    def _load(self) -> None:
+        if not os.path.exists(self.file_path):
+            return
+
+        complete_size = 0
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # a crash left a partially written last line behind
+                    logger.warning(f"Dropping partial journal line: {line!r}")
+                    break
+                complete_size += len(line)
+                try:
+                    event = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    logger.warning(f"Ignoring malformed journal line: {line!r}")
+                    continue
+                self._apply(event)
+
+        # truncate back to the last complete line, so the next event starts on a line of its own
+        if complete_size < os.path.getsize(self.file_path):
+            with open(self.file_path, "r+b") as f:
+                f.truncate(complete_size)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _apply(self, event: Dict) -> None:
+        if event["event"] == BEGUN:
+            self.runs[event["run"]] = event["input"]
+            return
+        if event["event"] == FINISHED:
+            self.finished_runs.add(event["run"])
+            return
+
+        if event["event"] == PLANNED:
+            self.operations[event["key"]] = event
+        if event["event"] == DONE and event.get("pageId"):
+            self.operations.get(event["key"], {})["pageId"] = event["pageId"]
+        self.states[event["key"]] = event["event"]
+
+    def _append(self, *events: Dict) -> None:
+        if not events:
+            return
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(event, default=str) + "\n" for event in events))
+            f.flush()
+            os.fsync(f.fileno())
+        for event in events:
+            self._apply(event)
+
+    def begin(self, input_digest: str) -> str:
+        """
+        Records the start of a new sync run.
+
+        Args:
+            input_digest (str): The digest of the ratings or plan being synced.
+
+        Returns:
+            str: The ID of the new run.
+        """
+        run_id = uuid.uuid4().hex
+        self._append({"event": BEGUN, "run": run_id, "input": input_digest})
+        return run_id
+
+    def resumable_run(self, input_digest: str) -> Optional[str]:
+        """
+        Finds the latest unfinished run that was syncing the same input.
+
+        Args:
+            input_digest (str): The digest of the ratings or plan being synced.
+
+        Returns:
+            Optional[str]: The ID of the run to resume, or None if there is nothing to resume.
+        """
+        for run_id, run_input in reversed(list(self.runs.items())):
+            if run_input == input_digest:
+                return None if run_id in self.finished_runs else run_id
+        return None
+
+    def has_finished(self, input_digest: str) -> bool:
+        """
+        Checks whether a run syncing the same input was completed.
+
+        Args:
+            input_digest (str): The digest of the ratings or plan being synced.
+
+        Returns:
+            bool: True if every operation of such a run was applied.
+        """
+        return any(
+            run_input == input_digest and run_id in self.finished_runs
+            for run_id, run_input in self.runs.items()
+        )
+
+    def plan(self, run_id: str, operation: str, entries: List[Dict]) -> None:
+        """
+        Records operations that are about to be applied. Already planned operations are left as they are.
+
+        All new operations are written in a single append, so planning a large sync costs one fsync.
+
+        Args:
+            run_id (str): The run the operations belong to.
+            operation (str): The operation type, "create", "update" or "archive".
+            entries (List[Dict]): The book entries to apply the operation to.
+        """
+        events = {}
+        for entry in entries:
+            key = self.make_key(run_id, operation, entry["book"])
+            if key in self.states or key in events:
+                continue
+            events[key] = {
+                "event": PLANNED,
+                "run": run_id,
+                "key": key,
+                "op": operation,
+                "entry": entry,
+            }
+        self._append(*events.values())
+
+    def start(self, key: str) -> None:
+        """
+        Records that an operation is being sent to Notion.
+
+        Args:
+            key (str): The idempotency key of the operation.
+        """
+        self._append({"event": STARTED, "key": key})
+
+    def complete(self, key: str, page_id: Optional[str] = None) -> None:
+        """
+        Records that Notion acknowledged an operation.
+
+        Args:
+            key (str): The idempotency key of the operation.
+            page_id (Optional[str]): The ID of the created or updated page.
+        """
+        self._append({"event": DONE, "key": key, "pageId": page_id})
+
+    def finish(self, run_id: str) -> None:
+        """
+        Records that every operation of a run was applied.
+
+        Args:
+            run_id (str): The run that was completed.
+        """
+        self._append({"event": FINISHED, "run": run_id})
+
+    def is_done(self, key: str) -> bool:
+        return self.states.get(key) == DONE
+
+    def was_started(self, key: str) -> bool:
+        return self.states.get(key) == STARTED
+
+    def pending_operations(self, run_id: str) -> List[Dict]:
+        """
+        Returns the operations of a run that were planned but never acknowledged, in the order they were planned.
+
+        Args:
+            run_id (str): The run to resume.
+
+        Returns:
+            List[Dict]: The pending operations, each with "key", "op" and "entry".
+        """
+        if run_id in self.finished_runs:
+            return []
+        return [
+            operation
+            for key, operation in self.operations.items()
+            if operation["run"] == run_id and not self.is_done(key)
+        ]
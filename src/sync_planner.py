@@ -0,0 +1,270 @@
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, Union
+
+from notion_db_API import NOTION_REQUESTS_PER_SECOND
+from sync_journal import SyncJournal
+
+STAT_FIELDS = ("rating", "favorites", "least_favorites")
+
+
+class ChangePlan:
+    """
+    The changes a sync would make to the Notion database, computed without calling Notion.
+
+    Plans can be saved as JSON, reviewed, and applied later with BookManager.apply_plan.
+    """
+
+    def __init__(
+        self,
+        creates: List[Dict],
+        updates: List[Dict],
+        archives: List[Dict],
+        input_digest: str,
+        requests_per_second: float = NOTION_REQUESTS_PER_SECOND,
+        created_at: Optional[str] = None,
+        archive_orphans: bool = False,
+    ):
+        self.creates = creates
+        self.updates = updates
+        self.archives = archives
+        self.input_digest = input_digest
+        self.archive_orphans = archive_orphans
+        self.requests_per_second = requests_per_second
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
+
+    @property
+    def request_count(self) -> int:
+        """
+        The number of Notion requests needed to apply the plan.
+        """
+        return len(self.creates) + len(self.updates) + len(self.archives)
+
+    @property
+    def estimated_seconds(self) -> float:
+        """
+        The estimated time to apply the plan at the Notion rate limit.
+        """
+        return round(self.request_count / self.requests_per_second, 1)
+
+    @property
+    def plan_digest(self) -> str:
+        """
+        The digest of the planned changes, used to journal a saved plan separately from a direct sync of the
+        same ratings and to recognize a plan that was already applied.
+        """
+        return SyncJournal.digest(
+            {
+                "creates": self.creates,
+                "updates": self.updates,
+                "archives": self.archives,
+                "archive_orphans": self.archive_orphans,
+            }
+        )
+
+    def is_empty(self) -> bool:
+        return self.request_count == 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "created_at": self.created_at,
+            "input_digest": self.input_digest,
+            "archive_orphans": self.archive_orphans,
+            "requests_per_second": self.requests_per_second,
+            "request_count": self.request_count,
+            "estimated_seconds": self.estimated_seconds,
+            "creates": self.creates,
+            "updates": self.updates,
+            "archives": self.archives,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ChangePlan":
+        return cls(
+            creates=data["creates"],
+            updates=data["updates"],
+            archives=data["archives"],
+            input_digest=data["input_digest"],
+            requests_per_second=data.get(
+                "requests_per_second", NOTION_REQUESTS_PER_SECOND
+            ),
+            created_at=data.get("created_at"),
+            archive_orphans=data.get("archive_orphans", False),
+        )
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the plan to a JSON file.
+
+        Args:
+            file_path (str): The path to the plan file.
+        """
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path: str) -> "ChangePlan":
+        """
+        Reads a plan from a JSON file.
+
+        Args:
+            file_path (str): The path to the plan file.
+
+        Returns:
+            ChangePlan: The loaded plan.
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.creates)} creates, {len(self.updates)} updates, "
+            f"{len(self.archives)} archives: {self.request_count} requests, "
+            f"~{self.estimated_seconds}s at {self.requests_per_second} requests/s"
+        )
+
+
+class SyncPlanner:
+    """
+    A utility class for diffing new ratings against the ratings in the Notion database.
+    """
+
+    @staticmethod
+    def field_changes(
+        book_stats: Dict[str, Union[float, int]], existing_entry: Dict
+    ) -> Dict[str, Dict[str, Union[float, int, None]]]:
+        """
+        Compares the statistics of a book with its existing database entry.
+
+        Args:
+            book_stats (Dict[str, Union[float, int]]): The new statistics of the book.
+            existing_entry (Dict): The existing database entry of the book.
+
+        Returns:
+            Dict[str, Dict[str, Union[float, int, None]]]: The changed fields, each with its "old" and "new" value.
+        """
+        changes = {}
+        for field in STAT_FIELDS:
+            old_value = existing_entry.get(field, 0)
+            if book_stats[field] != old_value:
+                changes[field] = {"old": old_value, "new": book_stats[field]}
+        return changes
+
+    @staticmethod
+    def plan(
+        new_ratings: Dict[str, Dict],
+        existing_ratings: Dict[str, Dict],
+        archive_orphans: bool = False,
+        requests_per_second: float = NOTION_REQUESTS_PER_SECOND,
+    ) -> ChangePlan:
+        """
+        Computes the change plan for syncing new ratings to the database.
+
+        Args:
+            new_ratings (Dict[str, Dict]): Dictionary containing new ratings.
+            existing_ratings (Dict[str, Dict]): Dictionary containing existing ratings.
+            archive_orphans (bool): Whether to archive database entries for books that are no longer rated.
+            requests_per_second (float): The rate limit used to estimate how long the sync takes.
+
+        Returns:
+            ChangePlan: The planned creates, updates and archives.
+        """
+        creates = []
+        updates = []
+
+        for book_title, book_stats in new_ratings.items():
+            if book_title in existing_ratings:
+                existing_entry = existing_ratings[book_title]
+                changes = SyncPlanner.field_changes(book_stats, existing_entry)
+
+                if changes:
+                    updates.append(
+                        {
+                            **book_stats,
+                            "book": book_title,
+                            "pageId": existing_entry["pageId"],
+                            "changes": changes,
+                        }
+                    )
+            else:
+                creates.append({**book_stats, "book": book_title})
+
+        archives = []
+        if archive_orphans:
+            archives = [
+                {"book": book_title, "pageId": existing_entry["pageId"]}
+                for book_title, existing_entry in existing_ratings.items()
+                if book_title not in new_ratings
+            ]
+
+        return ChangePlan(
+            creates,
+            updates,
+            archives,
+            SyncJournal.digest(new_ratings),
+            requests_per_second,
+            archive_orphans=archive_orphans,
+        )
+
+    @staticmethod
+    def revalidate(
+        plan: ChangePlan, existing_ratings: Dict[str, Dict]
+    ) -> Tuple[ChangePlan, List[str]]:
+        """
+        Checks a saved plan against the current ratings in the database, dropping changes that no longer apply.
+
+        Creates are dropped if the book now exists, updates if the page is gone or any "old" value changed since
+        the plan was made, and archives if the page is gone.
+
+        Args:
+            plan (ChangePlan): The saved plan.
+            existing_ratings (Dict[str, Dict]): Dictionary containing the current existing ratings.
+
+        Returns:
+            Tuple[ChangePlan, List[str]]: The changes that still apply, and a message for every dropped change.
+        """
+        skipped = []
+
+        creates = []
+        for entry in plan.creates:
+            if entry["book"] in existing_ratings:
+                skipped.append(f"create {entry['book']}: the book already exists")
+            else:
+                creates.append(entry)
+
+        updates = []
+        for entry in plan.updates:
+            existing_entry = existing_ratings.get(entry["book"])
+            if existing_entry is None or existing_entry["pageId"] != entry["pageId"]:
+                skipped.append(f"update {entry['book']}: the page no longer exists")
+                continue
+            stale_fields = [
+                field
+                for field, change in entry["changes"].items()
+                if existing_entry.get(field, 0) != change["old"]
+            ]
+            if stale_fields:
+                skipped.append(
+                    f"update {entry['book']}: {', '.join(stale_fields)} changed since the plan was made"
+                )
+            else:
+                updates.append(entry)
+
+        archives = []
+        for entry in plan.archives:
+            existing_entry = existing_ratings.get(entry["book"])
+            if existing_entry is None or existing_entry["pageId"] != entry["pageId"]:
+                skipped.append(f"archive {entry['book']}: the page no longer exists")
+            else:
+                archives.append(entry)
+
+        revalidated_plan = ChangePlan(
+            creates,
+            updates,
+            archives,
+            plan.input_digest,
+            plan.requests_per_second,
+            plan.created_at,
+            plan.archive_orphans,
+        )
+        return revalidated_plan, skipped
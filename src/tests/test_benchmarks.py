@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+
+from bench_ingestion import (
+    BENCHMARKS_DIR,
+    baseline_path,
+    check_regressions,
+    run_benchmark,
+)
+from executors import normalize_ratings
+from synthetic_ratings import generate_rows, write_csv
+
+
+def test_generate_rows_is_deterministic():
+    rows = list(generate_rows(1_000, num_titles=50, num_members=10, seed=1))
+    assert len(rows) == 1_000
+    assert rows == list(generate_rows(1_000, num_titles=50, num_members=10, seed=1))
+    assert all(0 <= num_stars <= 5 for _, _, num_stars in rows)
+
+
+def test_generate_rows_is_messy_and_skewed():
+    rows = list(generate_rows(5_000, num_titles=50, num_members=10))
+    raw_titles = {book_title for book_title, _, _ in rows}
+    normalized_titles = {book_title for book_title, _ in normalize_ratings(rows)}
+    assert len(normalized_titles) < len(raw_titles)
+
+    counts = {}
+    for book_title, _, _ in rows:
+        key = book_title.strip().lower()
+        counts[key] = counts.get(key, 0) + 1
+    assert max(counts.values()) > 10 * min(counts.values())
+
+
+def make_result(rows_per_second, peak_rss_mb=100.0, peak_mb=10.0):
+    return {
+        "phases": {"read": {"rows_per_second": rows_per_second, "peak_mb": peak_mb}},
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def test_check_regressions():
+    baseline = make_result(1_000)
+    assert check_regressions(make_result(900), baseline, 0.2) == []
+    assert len(check_regressions(make_result(700), baseline, 0.2)) == 1
+    assert len(check_regressions(make_result(1_000, 130.0), baseline, 0.2)) == 1
+    assert len(check_regressions(make_result(1_000, peak_mb=13.0), baseline, 0.2)) == 1
+
+
+def test_baseline_path_depends_on_dataset():
+    assert baseline_path(1_000, "serial", "t50_m10_s0") != baseline_path(
+        1_000, "serial", "t50_m10_s1"
+    )
+
+
+def test_generate_rows_does_not_depend_on_hash_seed():
+    code = (
+        "from synthetic_ratings import generate_rows; "
+        "print(list(generate_rows(1_000, num_titles=200, num_members=50)))"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=BENCHMARKS_DIR,
+            env={**os.environ, "PYTHONHASHSEED": hash_seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for hash_seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+
+
+def test_streaming_benchmark(tmp_path):
+    file_path = str(tmp_path / "ratings.csv")
+    write_csv(file_path, 1_000, num_titles=50, num_members=10)
+    result = run_benchmark(file_path, 1_000, repeat=1, stream=True, trace_memory=False)
+    assert list(result["phases"]) == ["stream", "build", "aggregate"]
+    assert result["phases"]["stream"]["peak_mb"] is None
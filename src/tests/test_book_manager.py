@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+from notion_client.errors import APIErrorCode, APIResponseError
+
+from book_manager import BookManager
+from sync_journal import SyncJournal
+from sync_planner import SyncPlanner
+
+NEW_RATINGS = {
+    "Clean Code": {"rating": 4.0, "favorites": 1, "least_favorites": 0},
+    "Code Complete": {"rating": 3.5, "favorites": 0, "least_favorites": 0},
+}
+
+
+class FakeNotionAPI:
+    """
+    An in-memory stand-in for NotionDBAPI that can crash right after a page is created.
+    """
+
+    def __init__(self, crash_after_create: bool = False, error_after_create=None):
+        self.database_id = "database"
+        self.notion = None
+        self.pages = {}
+        self.calls = []
+        self.crash_after_create = crash_after_create
+        self.error_after_create = error_after_create
+
+    async def add_page(self, properties):
+        title = properties["Book Title"]["title"][0]["text"]["content"]
+        page = {"id": f"page-{len(self.pages) + 1}", "title": title}
+        self.pages[page["id"]] = page
+        self.calls.append(("create", title))
+        if self.crash_after_create:
+            self.crash_after_create = False
+            raise ConnectionError("Connection lost after the page was created")
+        if self.error_after_create is not None:
+            error, self.error_after_create = self.error_after_create, None
+            raise error
+        return page
+
+    async def update_page(self, page_id, properties):
+        self.calls.append(("update", page_id))
+        return self.pages.get(page_id, {"id": page_id})
+
+    async def archive_page(self, page_id):
+        self.calls.append(("archive", page_id))
+        return {"id": page_id}
+
+    async def find_pages_by_title(self, title):
+        self.calls.append(("find", title))
+        return [page for page in self.pages.values() if page["title"] == title]
+
+
+def created_titles(api):
+    return [page["title"] for page in api.pages.values()]
+
+
+def test_apply_plan_finishes_run(tmp_path):
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    api = FakeNotionAPI()
+    plan = SyncPlanner.plan(NEW_RATINGS, {})
+    asyncio.run(BookManager(api, journal=journal).apply_plan(plan))
+
+    assert created_titles(api) == ["Clean Code", "Code Complete"]
+    assert journal.resumable_run(plan.input_digest) is None
+
+
+def test_resume_after_crash_does_not_duplicate_pages(tmp_path):
+    file_path = str(tmp_path / "journal.jsonl")
+    api = FakeNotionAPI(crash_after_create=True)
+    plan = SyncPlanner.plan(NEW_RATINGS, {})
+    asyncio.run(BookManager(api, journal=SyncJournal(file_path)).apply_plan(plan))
+
+    # the first create reached Notion but was never acknowledged
+    journal = SyncJournal(file_path)
+    run_id = journal.resumable_run(plan.input_digest)
+    assert run_id is not None
+    assert journal.was_started(SyncJournal.make_key(run_id, "create", "Clean Code"))
+
+    api.calls = []
+    resumed = asyncio.run(
+        BookManager(api, journal=journal).resume_sync(plan.input_digest)
+    )
+
+    assert resumed
+    assert created_titles(api) == ["Clean Code", "Code Complete"]
+    assert ("create", "Clean Code") not in api.calls
+    assert ("find", "Clean Code") in api.calls
+    assert journal.resumable_run(plan.input_digest) is None
+
+
+def test_resume_replays_only_pending_operations(tmp_path):
+    file_path = str(tmp_path / "journal.jsonl")
+    existing_ratings = {
+        "Clean Code": {
+            "pageId": "page-0",
+            "rating": 3.0,
+            "favorites": 1,
+            "least_favorites": 0,
+        }
+    }
+    plan = SyncPlanner.plan(NEW_RATINGS, existing_ratings)
+
+    # simulate a run that only got as far as the update
+    journal = SyncJournal(file_path)
+    run_id = journal.begin(plan.input_digest)
+    journal.plan(run_id, "update", plan.updates)
+    journal.plan(run_id, "create", plan.creates)
+    journal.complete(SyncJournal.make_key(run_id, "update", "Clean Code"), "page-0")
+
+    api = FakeNotionAPI()
+    manager = BookManager(api, journal=SyncJournal(file_path))
+    assert asyncio.run(manager.resume_sync(plan.input_digest))
+    assert api.calls == [("create", "Code Complete")]
+    assert not asyncio.run(manager.resume_sync(plan.input_digest))
+
+
+def test_create_retry_finds_saved_page(tmp_path, monkeypatch):
+    monkeypatch.setattr("book_manager.RETRY_WAIT_SECONDS", 0)
+    error = APIResponseError(
+        httpx.Response(502), "Bad gateway", APIErrorCode.InternalServerError
+    )
+    api = FakeNotionAPI(error_after_create=error)
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    plan = SyncPlanner.plan({"Clean Code": NEW_RATINGS["Clean Code"]}, {})
+    asyncio.run(BookManager(api, journal=journal).apply_plan(plan))
+
+    assert created_titles(api) == ["Clean Code"]
+    assert api.calls == [("create", "Clean Code"), ("find", "Clean Code")]
+    assert journal.resumable_run(plan.input_digest) is None
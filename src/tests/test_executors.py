@@ -0,0 +1,64 @@
+import pytest
+
+from executors import (
+    create_executor,
+    default_executor_kind,
+    iter_chunks,
+    iter_partials,
+    merge_partials,
+    normalize_ratings,
+)
+
+ROWS = [
+    ("clean code", "alice", 3.0),
+    ("CODE COMPLETE ", "bob", 4.0),
+    ("Clean Code", " Alice", 5.0),
+    {"book_title": "refactoring", "member_name": "bob", "num_stars": "2"},
+]
+
+
+def test_normalize_ratings_keeps_latest_rating():
+    assert normalize_ratings(ROWS) == {
+        ("Clean Code", "Alice"): 5.0,
+        ("Code Complete", "Bob"): 4.0,
+        ("Refactoring", "Bob"): 2.0,
+    }
+
+
+@pytest.mark.parametrize("kind", ["thread", "process", "interpreter", "auto"])
+def test_parallel_matches_serial(kind):
+    expected = normalize_ratings(ROWS)
+    result = normalize_ratings(ROWS, kind, max_workers=2, chunk_size=1)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_merge_partials_later_chunks_win():
+    merged = merge_partials([{("A", "X"): 1.0, ("B", "X"): 2.0}, {("A", "X"): 3.0}])
+    assert list(merged.items()) == [(("A", "X"), 3.0), (("B", "X"), 2.0)]
+
+
+def test_unsupported_executor():
+    with pytest.raises(ValueError):
+        create_executor("gpu")
+
+
+@pytest.mark.parametrize("kind", ["serial", "thread"])
+def test_rows_are_read_lazily(kind):
+    consumed = []
+
+    def rows():
+        for i in range(100):
+            consumed.append(i)
+            yield (f"book {i}", "alice", 3.0)
+
+    partials = iter_partials(iter_chunks(rows(), 10), kind, max_workers=1)
+    next(partials)
+    # one worker keeps at most two chunks in flight
+    assert len(consumed) <= 30
+    assert len(merge_partials(partials)) == 90
+
+
+def test_single_worker_defaults_to_serial():
+    assert default_executor_kind(max_workers=1) == "serial"
+    assert default_executor_kind(max_workers=4) != "serial"
@@ -0,0 +1,70 @@
+import csv
+import json
+
+import pytest
+
+from exporters import StatsExporter, export_stats, get_exporter
+
+BOOK_STATS = [
+    ("Clean Code", {"rating": 4.5, "favorites": 1, "least_favorites": 0}),
+    ("Tom & Jerry | <Vol. 1>", {"rating": 2.0, "favorites": 0, "least_favorites": 1}),
+]
+
+
+def test_export_jsonl(tmp_path):
+    file_path = str(tmp_path / "stats.jsonl")
+    assert export_stats(iter(BOOK_STATS), file_path) == 2
+    with open(file_path) as f:
+        assert json.loads(f.readline()) == {
+            "book": "Clean Code",
+            "rating": 4.5,
+            "favorites": 1,
+            "least_favorites": 0,
+        }
+
+
+def test_export_csv(tmp_path):
+    file_path = str(tmp_path / "stats.csv")
+    export_stats(BOOK_STATS, file_path)
+    with open(file_path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["book", "rating", "favorites", "least_favorites"]
+    assert rows[1] == ["Clean Code", "4.5", "1", "0"]
+
+
+def test_export_markdown(tmp_path):
+    file_path = str(tmp_path / "stats.md")
+    export_stats(BOOK_STATS, file_path)
+    with open(file_path) as f:
+        report = f.read()
+    assert "| Clean Code | 4.5 | 1 | 0 |" in report
+    assert "Tom & Jerry \\| <Vol. 1>" in report
+
+
+def test_export_html(tmp_path):
+    file_path = str(tmp_path / "stats.html")
+    export_stats(BOOK_STATS, file_path)
+    with open(file_path) as f:
+        report = f.read()
+    assert "<td>Tom &amp; Jerry | &lt;Vol. 1&gt;</td>" in report
+    assert report.endswith("</html>\n")
+
+
+def test_export_parquet(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    file_path = str(tmp_path / "stats.parquet")
+    export_stats(BOOK_STATS, file_path)
+    assert parquet.read_table(file_path).column("book").to_pylist() == [
+        "Clean Code",
+        "Tom & Jerry | <Vol. 1>",
+    ]
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        get_exporter("stats.xlsx")
+
+
+def test_exporter_must_implement_write(tmp_path):
+    with pytest.raises(TypeError):
+        StatsExporter(str(tmp_path / "stats.txt"))
@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+from input_adapters import (
+    CSVAdapter,
+    GoodreadsAdapter,
+    JSONLAdapter,
+    RatingRow,
+    TSVAdapter,
+    get_adapter,
+    read_ratings,
+)
+
+TEST_RATINGS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "test_files", "test_ratings.csv"
+)
+
+
+def write(tmp_path, name, content):
+    file_path = tmp_path / name
+    file_path.write_text(content)
+    return str(file_path)
+
+
+def test_csv_without_header():
+    rows, errors = read_ratings(TEST_RATINGS)
+    assert rows[0] == RatingRow("The Pragmatic Programmer", "Alice", 5.0)
+    assert len(rows) == 3
+    assert errors == []
+
+
+def test_csv_with_header(tmp_path):
+    file_path = write(
+        tmp_path, "ratings.csv", "Member,Stars,Title\nAlice,4.5,Clean Code\n"
+    )
+    assert CSVAdapter().read_rows(file_path) == [RatingRow("Clean Code", "Alice", 4.5)]
+
+
+def test_bad_rows_are_collected(tmp_path):
+    file_path = write(
+        tmp_path,
+        "ratings.csv",
+        "Clean Code,Alice,4\nClean Code,Bob,six\nClean Code,,3\nCode Complete,Bob,7\n",
+    )
+    rows, errors = read_ratings(file_path)
+    assert rows == [RatingRow("Clean Code", "Alice", 4.0)]
+    assert [error.line_number for error in errors] == [2, 3, 4]
+
+
+def test_tsv_streaming(tmp_path):
+    file_path = write(tmp_path, "ratings.tsv", "Clean Code\tAlice\t3\n")
+    assert list(TSVAdapter().iter_rows(file_path)) == [
+        RatingRow("Clean Code", "Alice", 3.0)
+    ]
+
+
+def test_jsonl(tmp_path):
+    file_path = write(
+        tmp_path,
+        "ratings.jsonl",
+        '{"book_title": "Clean Code", "member_name": "Alice", "num_stars": 4}\n'
+        "\n"
+        '{"book_title": "Clean Code", "member_name": "Bob"}\n',
+    )
+    adapter = JSONLAdapter()
+    assert adapter.read_rows(file_path) == [RatingRow("Clean Code", "Alice", 4.0)]
+    assert [error.line_number for error in adapter.errors] == [3]
+
+
+def test_jsonl_malformed_line(tmp_path):
+    file_path = write(
+        tmp_path,
+        "ratings.jsonl",
+        '{"book_title": "Clean Code", "member_name": "Alice", "num_stars": 4}\n{"book',
+    )
+    adapter = JSONLAdapter()
+    assert len(adapter.read_rows(file_path)) == 1
+    assert [error.line_number for error in adapter.errors] == [2]
+
+
+def test_goodreads_export(tmp_path):
+    file_path = write(
+        tmp_path,
+        "goodreads_library_export.csv",
+        "Book Id,Title,Author,My Rating,Exclusive Shelf\n"
+        '1,"Clean Code",Robert C. Martin,5,read\n'
+        "2,Code Complete,Steve McConnell,0,to-read\n",
+    )
+    adapter = get_adapter(file_path, "goodreads", member_name="Alice")
+    assert isinstance(adapter, GoodreadsAdapter)
+    assert adapter.read_rows(file_path) == [RatingRow("Clean Code", "Alice", 5.0)]
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        get_adapter("ratings.csv", "xlsx")
+
+
+def test_unknown_extension_is_read_as_csv(tmp_path):
+    file_path = write(tmp_path, "ratings.txt", "Clean Code,Alice,4\n")
+    assert isinstance(get_adapter(file_path), CSVAdapter)
+    assert read_ratings(file_path)[0] == [RatingRow("Clean Code", "Alice", 4.0)]
+
+
+def test_blank_and_invalid_csv_rows(tmp_path):
+    file_path = write(
+        tmp_path,
+        "ratings.csv",
+        "\n , ,\nClean Code,Alice,nan\nClean Code\n  Clean Code , Bob ,5\n",
+    )
+    rows, errors = read_ratings(file_path)
+    assert rows == [RatingRow("Clean Code", "Bob", 5.0)]
+    assert [error.line_number for error in errors] == [3, 4]
+
+
+def test_jsonl_non_string_values(tmp_path):
+    file_path = write(
+        tmp_path,
+        "ratings.jsonl",
+        '{"book_title": 1984, "member_name": "Alice", "num_stars": 4}\n'
+        '{"book_title": ["Clean Code"], "member_name": "Bob", "num_stars": 4}\n'
+        '{"book_title": "Clean Code", "member_name": {"name": "Bob"}, "num_stars": 4}\n',
+    )
+    rows, errors = read_ratings(file_path)
+    assert rows == [RatingRow("1984", "Alice", 4.0)]
+    assert [error.line_number for error in errors] == [2, 3]
+
+
+def test_file_not_found():
+    with pytest.raises(FileNotFoundError):
+        read_ratings("does_not_exist.csv")
+
+
+def test_goodreads_short_row_is_collected(tmp_path):
+    file_path = write(
+        tmp_path,
+        "goodreads_library_export.csv",
+        "Title,Author,My Rating\nShort\nClean Code,Robert C. Martin,4\n",
+    )
+    rows, errors = read_ratings(file_path, "goodreads", member_name="Alice")
+    assert rows == [RatingRow("Clean Code", "Alice", 4.0)]
+    assert [error.line_number for error in errors] == [2]
@@ -0,0 +1,64 @@
+from notion_page_parser import NotionPageParser
+
+
+def make_page(page_id, title, rating=4.5, favorites=1, least_favorites=0):
+    return {
+        "id": page_id,
+        "properties": {
+            "Book Title": {"title": [{"text": {"content": title}}]},
+            "Rating": {"number": rating},
+            "Favorites": {"number": favorites},
+            "Least Favorites": {"number": least_favorites},
+        },
+    }
+
+
+def test_parse_pages():
+    pages = [make_page("1", "clean code  "), make_page("2", "Code Complete", 3, 0, 1)]
+    assert NotionPageParser.parse_pages(pages) == {
+        "Clean Code": {
+            "pageId": "1",
+            "rating": 4.5,
+            "favorites": 1,
+            "least_favorites": 0,
+        },
+        "Code Complete": {
+            "pageId": "2",
+            "rating": 3,
+            "favorites": 0,
+            "least_favorites": 1,
+        },
+    }
+
+
+def test_parse_pages_skips_empty_title():
+    page = make_page("1", "")
+    page["properties"]["Book Title"]["title"] = []
+    assert NotionPageParser.parse_pages([page]) == {}
+
+
+def test_parse_page_missing_number():
+    page = make_page("1", "Clean Code")
+    del page["properties"]["Favorites"]
+    page["properties"]["Rating"]["number"] = None
+    entry = NotionPageParser.parse_page(page)
+    assert entry["rating"] is None
+    assert entry["favorites"] is None
+    assert entry["least_favorites"] == 0
+
+
+def test_parse_pages_in_batches():
+    entries = NotionPageParser.parse_pages([make_page("1", "Clean Code")])
+    NotionPageParser.parse_pages([make_page("2", "Code Complete")], entries)
+    assert list(entries) == ["Clean Code", "Code Complete"]
+
+
+def test_property_ids():
+    database = {
+        "properties": {
+            "Book Title": {"id": "title"},
+            "Rating": {"id": "a%3Bc"},
+            "Favorites": {"id": "xyz"},
+        }
+    }
+    assert NotionPageParser.property_ids(database) == ["title", "a%3Bc", "xyz"]
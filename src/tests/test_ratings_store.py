@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+
+from book_club_aggregator import BookClubAggregator
+from ratings_store import RatingsStore
+
+JANUARY = datetime(2024, 1, 15, tzinfo=timezone.utc)
+FEBRUARY = datetime(2024, 2, 10, tzinfo=timezone.utc)
+
+
+def make_store():
+    store = RatingsStore()
+    store.add_ratings(
+        [("Clean Code", "Alice", 3.0), ("Clean Code", "Bob", 5.0)], JANUARY
+    )
+    store.add_ratings(
+        [("Clean Code", "Alice", 4.0), ("Clean Code", "Bob", 5.0)], FEBRUARY
+    )
+    return store
+
+
+def test_unchanged_ratings_are_not_appended():
+    store = make_store()
+    assert store.add_ratings([("Clean Code", "Bob", 5.0)], FEBRUARY) == 0
+    assert [stars for _, stars, _ in store.rating_history("Clean Code")] == [3, 5, 4]
+
+
+def test_book_stats_uses_latest_rating():
+    assert make_store().book_stats() == {
+        "Clean Code": {"rating": 4.5, "favorites": 1, "least_favorites": 0}
+    }
+
+
+def test_book_stats_window():
+    store = make_store()
+    assert store.book_stats(*RatingsStore.window("month", FEBRUARY)) == {
+        "Clean Code": {"rating": 4.0, "favorites": 0, "least_favorites": 0}
+    }
+    assert store.book_stats(*RatingsStore.window("month", JANUARY)) == {
+        "Clean Code": {"rating": 4.0, "favorites": 1, "least_favorites": 0}
+    }
+
+
+def test_trend():
+    store = make_store()
+    current = RatingsStore.window("month", FEBRUARY)
+    previous = RatingsStore.previous_window("month", FEBRUARY)
+    assert store.trend(current, previous) == {
+        "Clean Code": {"rating": 0.0, "favorites": -1, "least_favorites": 0}
+    }
+
+
+def test_previous_window_wraps_year():
+    assert RatingsStore.previous_window("month", JANUARY) == (
+        datetime(2023, 12, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_aggregator_records_ratings():
+    store = RatingsStore()
+    aggregator = BookClubAggregator(
+        [{"book_title": "clean code ", "member_name": "alice", "num_stars": "4"}],
+        store=store,
+        rated_at=JANUARY,
+    )
+    assert aggregator.aggregate_window_stats() == aggregator.aggregate_book_stats()
+    assert store.rating_history("Clean Code") == [("Alice", 4.0, JANUARY)]
+
+
+def test_latest_ratings_ignore_older_backfill():
+    store = make_store()
+    assert store.add_ratings([("Clean Code", "Alice", 2.0)], JANUARY) == 1
+    assert store.latest_ratings()[("Clean Code", "Alice")] == 4.0
+    assert store.book_stats() == store.book_stats(
+        datetime(2000, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+def test_latest_ratings_are_backfilled(tmp_path):
+    file_path = str(tmp_path / "ratings.sqlite3")
+    store = RatingsStore(file_path)
+    store.add_ratings([("Clean Code", "Alice", 3.0)], JANUARY)
+    store.add_ratings([("Clean Code", "Alice", 4.0)], FEBRUARY)
+    # a database from before latest_ratings existed
+    with store.connection:
+        store.connection.execute("DROP TABLE latest_ratings")
+    store.close()
+
+    reopened = RatingsStore(file_path)
+    assert reopened.latest_ratings() == {("Clean Code", "Alice"): 4.0}
+    assert reopened.add_ratings([("Clean Code", "Alice", 4.0)], FEBRUARY) == 0
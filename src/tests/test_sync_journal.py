@@ -0,0 +1,57 @@
+from sync_journal import SyncJournal
+
+NEW_RATINGS = SyncJournal.digest(
+    {"Clean Code": {"rating": 4.0, "favorites": 1, "least_favorites": 0}}
+)
+
+
+def test_pending_operations_survive_reload(tmp_path):
+    file_path = str(tmp_path / "journal.jsonl")
+    journal = SyncJournal(file_path)
+    run_id = journal.begin(NEW_RATINGS)
+    journal.plan(run_id, "create", [{"book": "Clean Code"}, {"book": "Code Complete"}])
+    journal.start(SyncJournal.make_key(run_id, "create", "Clean Code"))
+    journal.complete(SyncJournal.make_key(run_id, "create", "Clean Code"), "page-1")
+
+    reloaded = SyncJournal(file_path)
+    assert reloaded.resumable_run(NEW_RATINGS) == run_id
+    assert [
+        operation["entry"] for operation in reloaded.pending_operations(run_id)
+    ] == [{"book": "Code Complete"}]
+
+
+def test_finished_run_is_not_resumable(tmp_path):
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    run_id = journal.begin(NEW_RATINGS)
+    journal.finish(run_id)
+    assert journal.resumable_run(NEW_RATINGS) is None
+    assert journal.resumable_run(SyncJournal.digest({})) is None
+
+
+def test_malformed_last_line_is_ignored(tmp_path):
+    file_path = tmp_path / "journal.jsonl"
+    journal = SyncJournal(str(file_path))
+    run_id = journal.begin(NEW_RATINGS)
+    journal.plan(run_id, "update", [{"book": "Clean Code", "pageId": "page-1"}])
+    with open(file_path, "a") as f:
+        f.write('{"event": "do')
+
+    key = SyncJournal.make_key(run_id, "update", "Clean Code")
+    reloaded = SyncJournal(str(file_path))
+    assert not reloaded.is_done(key)
+    assert len(reloaded.pending_operations(run_id)) == 1
+
+    # the next event must not be glued onto the partial line
+    reloaded.start(key)
+    assert SyncJournal(str(file_path)).was_started(key)
+
+
+def test_plan_is_written_with_one_fsync(tmp_path, monkeypatch):
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    run_id = journal.begin(NEW_RATINGS)
+    fsyncs = []
+    monkeypatch.setattr("sync_journal.os.fsync", fsyncs.append)
+    entries = [{"book": f"Book {i}"} for i in range(100)]
+    journal.plan(run_id, "create", entries)
+    assert len(fsyncs) == 1
+    assert len(SyncJournal(journal.file_path).pending_operations(run_id)) == 100
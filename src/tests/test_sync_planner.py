@@ -0,0 +1,104 @@
+import asyncio
+
+from main import apply_saved_plan
+from sync_journal import SyncJournal
+from sync_planner import ChangePlan, SyncPlanner
+
+NEW_RATINGS = {
+    "Clean Code": {"rating": 4.0, "favorites": 1, "least_favorites": 0},
+    "Code Complete": {"rating": 3.5, "favorites": 0, "least_favorites": 0},
+    "Refactoring": {"rating": 5.0, "favorites": 2, "least_favorites": 0},
+}
+EXISTING_RATINGS = {
+    "Clean Code": {"pageId": "1", "rating": 4.0, "favorites": 1, "least_favorites": 0},
+    "Code Complete": {
+        "pageId": "2",
+        "rating": 3.0,
+        "favorites": 0,
+        "least_favorites": 0,
+    },
+    "Design Patterns": {
+        "pageId": "3",
+        "rating": 2.0,
+        "favorites": 0,
+        "least_favorites": 1,
+    },
+}
+
+
+def test_plan():
+    plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS)
+    assert plan.creates == [{**NEW_RATINGS["Refactoring"], "book": "Refactoring"}]
+    assert len(plan.updates) == 1
+    assert plan.updates[0]["pageId"] == "2"
+    assert plan.updates[0]["changes"] == {"rating": {"old": 3.0, "new": 3.5}}
+    assert plan.archives == []
+
+
+def test_plan_archive_orphans():
+    plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS, archive_orphans=True)
+    assert plan.archives == [{"book": "Design Patterns", "pageId": "3"}]
+    assert plan.request_count == 3
+    assert plan.estimated_seconds == 1.0
+
+
+def test_plan_missing_number_is_updated():
+    existing_ratings = {
+        "Clean Code": {
+            "pageId": "1",
+            "rating": None,
+            "favorites": 1,
+            "least_favorites": 0,
+        }
+    }
+    plan = SyncPlanner.plan({"Clean Code": NEW_RATINGS["Clean Code"]}, existing_ratings)
+    assert plan.updates[0]["changes"] == {"rating": {"old": None, "new": 4.0}}
+
+
+def test_save_and_load(tmp_path):
+    plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS, archive_orphans=True)
+    file_path = str(tmp_path / "plan.json")
+    plan.save(file_path)
+    assert ChangePlan.load(file_path).to_dict() == plan.to_dict()
+
+
+def test_plan_digest():
+    plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS)
+    same_plan = ChangePlan.from_dict({**plan.to_dict(), "created_at": "later"})
+    orphans_plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS, True)
+    assert plan.plan_digest == same_plan.plan_digest
+    assert plan.plan_digest != plan.input_digest
+    assert plan.plan_digest != orphans_plan.plan_digest
+    assert plan.input_digest == orphans_plan.input_digest
+
+
+def test_applied_plan_is_not_applied_again(tmp_path, capsys):
+    plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS)
+    plan_file = str(tmp_path / "plan.json")
+    plan.save(plan_file)
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    journal.finish(journal.begin(plan.plan_digest))
+
+    asyncio.run(apply_saved_plan(plan_file, journal.file_path))
+    assert "already applied" in capsys.readouterr().out
+    assert SyncJournal(journal.file_path).runs == journal.runs
+
+
+def test_revalidate_stale_plan():
+    plan = SyncPlanner.plan(NEW_RATINGS, EXISTING_RATINGS, archive_orphans=True)
+
+    # a sync since the dry run created Refactoring and changed Code Complete
+    current_ratings = {
+        **EXISTING_RATINGS,
+        "Code Complete": {**EXISTING_RATINGS["Code Complete"], "rating": 3.5},
+        "Refactoring": {"pageId": "4", **NEW_RATINGS["Refactoring"]},
+    }
+    revalidated_plan, skipped = SyncPlanner.revalidate(plan, current_ratings)
+    assert revalidated_plan.creates == []
+    assert revalidated_plan.updates == []
+    assert revalidated_plan.archives == plan.archives
+    assert len(skipped) == 2
+
+    unchanged_plan, skipped = SyncPlanner.revalidate(plan, EXISTING_RATINGS)
+    assert unchanged_plan.to_dict() == plan.to_dict()
+    assert skipped == []